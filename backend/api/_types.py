@@ -1,7 +1,55 @@
-from __future__ import annotations
-from pydantic import BaseModel, Field
+import operator
+import sys
+from functools import cached_property, lru_cache
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_serializer, field_validator
 from typing import List, Optional
 
+# Shared config for all extraction models: schema build is deferred until the
+# first validation (keeps worker import time and RSS down when only one side
+# of the JD/Resume tree is exercised), unknown keys from extractors are
+# dropped, and instances are frozen after validation.
+_STRUCTURED_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True, defer_build=True)
+
+# C-level attribute access for hot aggregations over model lists
+_GET_DURATION = operator.attrgetter("duration")
+
+
+def _intern_str(value):
+    """
+    Intern a validated string field.
+
+    Fields like employment_type, location_type, currency, and degree draw from
+    a tiny vocabulary ("Full-time", "Remote", "USD", "BS", ...). Interning
+    them means N parsed documents share one Python string per distinct value
+    and equality checks become pointer compares.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _pack_month_year(value):
+    """
+    Parse an "MM-YYYY" date string into a packed month index (year*12 + month-1).
+
+    Packed dates compare and subtract as plain integers, so sorting by recency
+    or computing "months between" needs no string parsing after validation.
+    Already-packed ints and None pass through unchanged.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    first, _, second = value.partition("-")
+    if len(first) == 4:  # tolerate "YYYY-MM" from extractors
+        first, second = second, first
+    return int(second) * 12 + (int(first) - 1)
+
+
+def _format_month_year(value: Optional[int]) -> Optional[str]:
+    """Serialize a packed month index back to the "MM-YYYY" wire format."""
+    if value is None:
+        return None
+    return f"{value % 12 + 1:02d}-{value // 12:04d}"
+
 ###################################################################### JD  #############################################################################
 #                                                                 Structured Data 
 ############################################################# Pydantic Model Schemas ###################################################################
@@ -22,6 +70,8 @@ class Qualifications(BaseModel):
     )
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     education: Optional[str] = Field(None, description="Education requirements")
     experience: Optional[str] = Field(None, description="Experience requirements")
     skills: Optional[List[str]] = Field(None, description="Skills requirements")
@@ -38,10 +88,14 @@ class SalaryRange(BaseModel):
     salary_range = SalaryRange(currency="USD", lower_limit=100000, upper_limit=120000)
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     currency: Optional[str] = Field(None, description="Currency of the compensation offered. E.g., USD, CAD, AUD, INR, GBP, etc.")
     lower_limit: Optional[int] = Field(None, description="lowest bound of the compensation/salary range")
     upper_limit: Optional[int] = Field(None, description="higher bound of the compensation/salary range")
 
+    _intern_fields = field_validator("currency")(_intern_str)
+
 class Benefits(BaseModel):
     """
     Pydantic model for benefits offered for the job.
@@ -58,6 +112,8 @@ class Benefits(BaseModel):
     )
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     relocation_assistance: bool = Field(..., description="Whether relocation assistance is provided for the job")
     equity: bool = Field(..., description="Is Equity offered?")
     pto: bool = Field(..., description="Is PTO offered?")
@@ -67,6 +123,25 @@ class Benefits(BaseModel):
     four_oh_one_k: bool = Field(..., description="is 401k offered?")
     free_lunch: bool = Field(..., description="Is free lunch offered at office if it is an on-site job?")
     other: str = Field(..., description="what are the additional benefits offered if any?")
+
+    def to_mask(self) -> int:
+        """
+        Pack the boolean benefit flags into a single integer bitmask.
+
+        Useful for bulk filtering over many JDs (e.g. "has 401k and health")
+        where `(mask & required) == required` replaces eight attribute
+        lookups per record.
+        """
+        return (
+            self.equity << 0
+            | self.pto << 1
+            | self.health << 2
+            | self.dental << 3
+            | self.vision << 4
+            | self.four_oh_one_k << 5
+            | self.free_lunch << 6
+            | self.relocation_assistance << 7
+        )
     
 class OtherInformation(BaseModel):
     """
@@ -88,6 +163,8 @@ class OtherInformation(BaseModel):
     )
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     bonus_qualifications: List[str] = Field(..., description="Bonus qualifications mentioned in the job description that are not mandatory but potentially beneficial")
     salary_range: Optional[SalaryRange] = Field(None, description="Salary range for the job")
     benefits: Benefits = Field(..., description="Benefits offered for the job")
@@ -130,6 +207,8 @@ class JDStructuredData(BaseModel):
     )
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     job_title: str = Field(..., description="Title/Position/Role of the job. For example: Software Engineer, Data Scientist, etc.")
     company_name: str = Field(..., description="Name of the company hiring for the position")
     location: List[str] = Field(..., description="Location(s) where the job is offered at")
@@ -139,7 +218,28 @@ class JDStructuredData(BaseModel):
     required_qualifications: Qualifications = Field(..., description="Required qualifications for the job")
     preferred_qualifications: Qualifications = Field(..., description="Preferred qualifications for the job")
     other_information: OtherInformation = Field(..., description="Other information about the job")
-    
+
+    _intern_fields = field_validator("employment_type", "location_type")(_intern_str)
+
+    @classmethod
+    def assemble(cls, **fields) -> "JDStructuredData":
+        """
+        Build a JDStructuredData from already-validated field values without
+        re-running validation. Only safe for internal assembly paths where
+        every child is a validated model instance.
+        """
+        return cls.model_construct(**fields)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize to JSON bytes via orjson, dropping None-valued fields.
+
+        Emits bytes directly (no intermediate str) and skips the frequently
+        null Optional fields, shrinking both CPU and payload size at response
+        boundaries.
+        """
+        return orjson.dumps(self.model_dump(mode="json", exclude_none=True))
+
 
 
 #################################################################### Resume  ###########################################################################
@@ -167,6 +267,8 @@ class ContactInformation(BaseModel):
     )
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     
     name: str = Field(..., description="Name of the candidate")
     email: str = Field(..., description="Email address of the candidate")
@@ -195,14 +297,23 @@ class Education(BaseModel):
     )
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     
     degree: str = Field(..., description="Degree of the education. For example: BS/Bachelor's, MS/Master's, PhD/Doctoral, MBA/Master of Business Administration, etc.")
     major: str = Field(..., description="Major of the education. For example: Computer Science, Business Administration, etc.")
     school: str = Field(..., description="Name of the school or university")
-    graduation_date: str = Field(..., description="Graduation date of the education in MM-YYYY format")
+    graduation_date: int = Field(..., description="Graduation date of the education in MM-YYYY format")
     gpa: float | None = Field(None, description="GPA of the education")
     relevant_coursework: List[str] | None = Field(None, description="Relevant coursework of the education")
 
+    _intern_fields = field_validator("degree")(_intern_str)
+    _pack_dates = field_validator("graduation_date", mode="before")(_pack_month_year)
+
+    @field_serializer("graduation_date")
+    def _serialize_dates(self, value: int) -> str:
+        return _format_month_year(value)
+
 class Experience(BaseModel):
     """
     Pydantic model for work experience of the candidate.
@@ -223,6 +334,8 @@ class Experience(BaseModel):
     )
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     
     employer: str = Field(..., description="Name of the company where the candidate is currently employed or the most recent employer")
     position: str = Field(..., description="Position or role at the current company or the most recent position")
@@ -252,11 +365,19 @@ class Internship(BaseModel):
     )
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     
     company: str = Field(..., description="Name of the company where the candidate interned")
     title: str = Field(..., description="Title of the internship")
-    start_date: str = Field(..., description="Start date of the internship in MM-YYYY format")
-    end_date: str | None = Field(None, description="End date of the internship in MM-YYYY format")
+    start_date: int = Field(..., description="Start date of the internship in MM-YYYY format")
+    end_date: int | None = Field(None, description="End date of the internship in MM-YYYY format")
+
+    _pack_dates = field_validator("start_date", "end_date", mode="before")(_pack_month_year)
+
+    @field_serializer("start_date", "end_date")
+    def _serialize_dates(self, value: int | None) -> str | None:
+        return _format_month_year(value)
     description: str = Field(..., description="Description of the internship")
     tech_stack: List[str] = Field(..., description="Tech stack of the internship")
     outcomes: List[str] = Field(..., description="Outcomes of the internship")
@@ -281,9 +402,17 @@ class Project(BaseModel):
     )
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     name: str = Field(..., description="Name of the project")
-    start_date: str = Field(..., description="Start date of the project in MM-YYYY format")
-    end_date: str | None = Field(None, description="End date of the project in MM-YYYY format")
+    start_date: int = Field(..., description="Start date of the project in MM-YYYY format")
+    end_date: int | None = Field(None, description="End date of the project in MM-YYYY format")
+
+    _pack_dates = field_validator("start_date", "end_date", mode="before")(_pack_month_year)
+
+    @field_serializer("start_date", "end_date")
+    def _serialize_dates(self, value: int | None) -> str | None:
+        return _format_month_year(value)
     description: str = Field(..., description="Description of the project")
     tech_stack: List[str] = Field(..., description="Tech stack of the project")
     role: str = Field(..., description="Role of the candidate in the project")
@@ -301,19 +430,31 @@ class Certification(BaseModel):
     certification = Certification(name="Certification 1", issuing_organization="Organization 1", issue_date="01-2020", expiration_date="05-2020", credential_id="1234567890", credential_url="https://certification.com/1234567890")
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     name: str = Field(..., description="Name of the certification")
     issuing_organization: str = Field(..., description="Issuing organization of the certification")
-    issue_date: str = Field(..., description="Issue date of the certification in MM-YYYY format")
-    expiration_date: str = Field(..., description="Expiration date of the certification in MM-YYYY format")
+    issue_date: int = Field(..., description="Issue date of the certification in MM-YYYY format")
+    expiration_date: int = Field(..., description="Expiration date of the certification in MM-YYYY format")
     credential_id: str = Field(..., description="Credential ID of the certification")
     credential_url: str = Field(..., description="Credential URL of the certification")
+
+    _pack_dates = field_validator("issue_date", "expiration_date", mode="before")(_pack_month_year)
+
+    @field_serializer("issue_date", "expiration_date")
+    def _serialize_dates(self, value: int) -> str:
+        return _format_month_year(value)
     
 class ResearchAndPublication(BaseModel):
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     title: str = Field(..., description="Title or name of the work/research published")
     url: str = Field(..., description="URL of the published work/research")
     
     
 class ResumeOtherInformation(BaseModel):
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     awards_and_achievements: List[str] = Field(..., description="Awards and achievements of the candidate.For example: Employee of the Month, Best Project Award, Dean's List, Fellowships, etc.")
     research_and_publications: List[ResearchAndPublication] = Field(..., description="Research and publications of the candidate")
     volunteering: str = Field(..., description="Volunteering experience of the candidate")
@@ -409,6 +550,8 @@ class ResumeStructuredData(BaseModel):
     )
     ```
     """
+    model_config = _STRUCTURED_MODEL_CONFIG
+
     
     summary: str = Field(..., description="Summary of the resume")
     job_title: str = Field(..., description="Current Job title of the candidate or the position they are applying for")
@@ -419,4 +562,77 @@ class ResumeStructuredData(BaseModel):
     projects: List[Project] = Field(..., description="Projects worked on by the candidate")
     certifications: List[Certification] = Field(..., description="Certifications obtained by the candidate")
     other_information: ResumeOtherInformation = Field(..., description="Other information of the candidate")
-    technical_skills: List[str] = Field(..., description="Technical Skills of the candidate")
\ No newline at end of file
+    technical_skills: List[str] = Field(..., description="Technical Skills of the candidate")
+
+    @cached_property
+    def total_experience_years(self) -> float:
+        """Total years across all experience entries.
+
+        The model is frozen after parsing, so the sum is computed once on
+        first access and cached on the instance; matching, rationale, and
+        recommendation services all consume it.
+        """
+        return sum(map(_GET_DURATION, self.experience or ()))
+
+    @classmethod
+    def assemble(cls, **fields) -> "ResumeStructuredData":
+        """
+        Build a ResumeStructuredData from already-validated field values
+        without re-running validation. Only safe for internal assembly paths
+        where every child is a validated model instance.
+        """
+        return cls.model_construct(**fields)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize to JSON bytes via orjson, dropping None-valued fields.
+
+        See `JDStructuredData.to_bytes` for rationale.
+        """
+        return orjson.dumps(self.model_dump(mode="json", exclude_none=True))
+
+############################################################## Reusable Type Adapters ##################################################################
+
+@lru_cache(maxsize=1)
+def get_jd_adapter() -> TypeAdapter[JDStructuredData]:
+    """
+    Cached TypeAdapter for JDStructuredData.
+
+    `validate_json` parses and validates in a single pydantic-core pass,
+    avoiding the intermediate dict a `json.loads` + `model_validate` round
+    trip would allocate. Cached so the adapter (and the deferred schema
+    build it triggers) is paid once per process.
+    """
+    return TypeAdapter(JDStructuredData)
+
+
+@lru_cache(maxsize=1)
+def get_resume_adapter() -> TypeAdapter[ResumeStructuredData]:
+    """
+    Cached TypeAdapter for ResumeStructuredData.
+
+    See `get_jd_adapter` for rationale.
+    """
+    return TypeAdapter(ResumeStructuredData)
+
+
+def _trim_field_descriptions() -> None:
+    """
+    Drop Field description strings from every model in this module.
+
+    The descriptions exist to seed extraction prompts and OpenAPI docs;
+    workers that serve neither can shed them from resident memory. Runs
+    before any schema is built (defer_build), so no rebuild is needed.
+    """
+    import inspect
+
+    for obj in list(globals().values()):
+        if inspect.isclass(obj) and issubclass(obj, BaseModel) and obj is not BaseModel:
+            for field in obj.model_fields.values():
+                field.description = None
+
+
+from api.config import settings  # noqa: E402  (needed only for the flag below)
+
+if settings.TRIM_SCHEMA_DESCRIPTIONS:
+    _trim_field_descriptions()
@@ -1,38 +1,96 @@
 """
 Supabase Authentication Utilities
 
-This module provides authentication using Supabase's official get_claims() method.
-It handles JWT token verification through Supabase's optimized infrastructure.
+This module verifies Supabase-issued JWTs locally against the project's JWKS.
+Signing keys are fetched once and cached in-process, so the per-request path
+is pure CPU work with no network round-trip.
 """
 
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
-from functools import lru_cache
 
+import jwt
+from jwt import PyJWKClient
 from fastapi import Header, HTTPException, status
-from supabase import create_client, Client
 from api.config import settings
 
 logger = logging.getLogger(__name__)
 
+_BEARER_PREFIX = "Bearer "
+_BEARER_LEN = len(_BEARER_PREFIX)
+
+# Preconstructed auth failure responses. FastAPI never mutates raised
+# HTTPExceptions, so reusing these saves an exception + headers dict
+# allocation on every failing request.
+_MISSING_AUTH_EXC = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Missing Authorization header",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_BAD_FORMAT_EXC = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid Authorization header format. Expected: Bearer <token>",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_INVALID_TOKEN_EXC = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid authentication token",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
 
 class SupabaseAuthError(Exception):
     """Custom exception for Supabase authentication errors."""
     pass
 
 
-@lru_cache(maxsize=1)
-def get_supabase_client() -> Client:
-    """
-    Get cached Supabase client for authentication operations.
+# TTL cache for verified claims, keyed by a hash of the raw token so JWTs are
+# never stored in memory. Signature verification (RSA/ECDSA) is CPU-heavy, so
+# repeat hits for the same bearer token become a dict lookup plus an exp check.
+_CLAIMS_CACHE: "OrderedDict[bytes, dict]" = OrderedDict()
+_CLAIMS_CACHE_MAXSIZE = 10_000
+_CLAIMS_CACHE_TTL = 60  # seconds
+_claims_cache_lock = threading.Lock()
 
-    Returns:
-        Cached Supabase client instance
-    """
-    return create_client(
-        supabase_url=settings.SUPABASE_URL,
-        supabase_key=settings.SUPABASE_SERVICE_ROLE_KEY,
-    )
+
+def _token_cache_key(token: str) -> bytes:
+    """Fast, fixed-size cache key for a raw bearer token."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _get_cached_claims(token: str) -> Optional[dict]:
+    """Return cached claims for the token if still fresh, else None."""
+    entry = _CLAIMS_CACHE.get(_token_cache_key(token))
+    if entry is None:
+        return None
+    cached_at, claims = entry
+    now = time.time()
+    if now - cached_at > _CLAIMS_CACHE_TTL or claims.get("exp", 0) <= now:
+        return None
+    return claims
+
+
+def _cache_claims(token: str, claims: dict) -> None:
+    """Insert verified claims into the TTL cache, evicting oldest entries."""
+    with _claims_cache_lock:
+        _CLAIMS_CACHE[_token_cache_key(token)] = (time.time(), claims)
+        while len(_CLAIMS_CACHE) > _CLAIMS_CACHE_MAXSIZE:
+            _CLAIMS_CACHE.popitem(last=False)
+
+
+# Module-level JWKS client singleton. Constructing it is cheap (no network
+# I/O happens until the first key lookup) and a plain module binding avoids
+# the call frame + lru_cache lock a cached accessor would pay per request.
+# PyJWKClient caches fetched signing keys in-process, so the JWKS endpoint is
+# only hit on cold start and key rotation.
+_JWKS_CLIENT = PyJWKClient(
+    f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json",
+    lifespan=3600,
+)
 
 
 def extract_bearer_token(authorization: Optional[str]) -> str:
@@ -49,30 +107,22 @@ def extract_bearer_token(authorization: Optional[str]) -> str:
         HTTPException: If header is missing or malformed
     """
     if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing Authorization header",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _MISSING_AUTH_EXC
 
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid Authorization header format. Expected: Bearer <token>",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if len(authorization) <= _BEARER_LEN or authorization[:_BEARER_LEN] != _BEARER_PREFIX:
+        raise _BAD_FORMAT_EXC
 
-    return authorization.split(" ", 1)[1]
+    return authorization[_BEARER_LEN:]
 
 
 def get_current_user_id_via_supabase(authorization: Optional[str] = Header(None)) -> str:
     """
-    FastAPI dependency to get authenticated user_id using Supabase's get_claims().
+    FastAPI dependency to get authenticated user_id via local JWT verification.
 
     This method provides:
-    - Official Supabase JWT verification
-    - Optimized performance with cached JWKS
-    - Automatic security updates from Supabase
+    - Local signature verification against Supabase's JWKS (no network call)
+    - In-process signing key caching via PyJWKClient
+    - Enforced 'exp' and 'sub' claims
 
     Usage:
         @router.post("/endpoint")
@@ -91,25 +141,36 @@ def get_current_user_id_via_supabase(authorization: Optional[str] = Header(None)
     """
     token = extract_bearer_token(authorization)
 
+    cached_claims = _get_cached_claims(token)
+    if cached_claims is not None:
+        return cached_claims["sub"]
+
     try:
-        supabase = get_supabase_client()
-        response = supabase.auth.get_claims(jwt=token)
-        # logger.info(f"Supabase get_claims response: {response}")
+        signing_key = _JWKS_CLIENT.get_signing_key_from_jwt(token)
+        claims = jwt.decode(
+            token,
+            signing_key.key,
+            algorithms=["RS256", "ES256"],
+            audience="authenticated",
+            options={"require": ["exp", "sub"]},
+        )
 
-        user_id = response.get("claims").get("sub")
-        if not user_id:
-            raise SupabaseAuthError("Token missing 'sub' claim")
+        # 'sub' presence is enforced by the decode options above; index
+        # directly and treat a miss as an invalid token without the generic
+        # traceback-logging path.
+        try:
+            user_id = claims["sub"]
+        except KeyError:
+            raise _INVALID_TOKEN_EXC from None
 
-        logger.debug(f"User authenticated via Supabase get_claims: {user_id}")
+        _cache_claims(token, claims)
+        logger.debug("User authenticated via local JWT verification: %s", user_id)
         return user_id
 
-    except Exception as e:
-        logger.error(f"Supabase get_claims failed: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    except (jwt.PyJWTError, SupabaseAuthError) as e:
+        # Bad tokens are routine (expired sessions, bots); log cheaply at
+        # warning level without a traceback.
+        logger.warning("JWT verification failed: %s", type(e).__name__)
+        raise _INVALID_TOKEN_EXC
 
 get_current_user_id = get_current_user_id_via_supabase
-
@@ -2,130 +2,235 @@
 Helper functions to process Reducto extraction data.
 """
 import re
+import sys
 import logging
-from typing import List, Set, Any, Dict
-from api.types.extraction import ResumeStructuredData, JDStructuredData
+from typing import TYPE_CHECKING, List, Set, Any, Dict
+
+# Annotation-only imports: skipping them at runtime trims module import time
+# and removes a circular-import landmine with the extraction type modules.
+if TYPE_CHECKING:
+    from api.types.extraction import ResumeStructuredData, JDStructuredData
 
 logger = logging.getLogger(__name__)
 
-def extract_skills_from_resume(resume: ResumeStructuredData) -> List[str]:
-    """Extract all technical skills from resume."""
-    skills = set()
-    
+# PII patterns fused into a single alternation compiled once at import, so
+# each call to mask_pii_data scans the text one time instead of six.
+# mask_pii_data runs per achievement / description across whole resumes, so
+# the function is bound by scan bandwidth. Ordering matters: it mirrors the
+# original sequential passes (email, phone, address, zip, url, profile), so
+# e.g. street numbers are consumed by the address alternative before the ZIP
+# alternative can see them. Only the address pattern is case-insensitive,
+# scoped via an inline (?i:...) group.
+_PII_PATTERNS = [
+    ('email', r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    ('phone', r'(?:\+?1[-.\s]?)?(?:\([0-9]{3}\)|[0-9]{3})[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}'),
+    ('address', r'(?i:\b\d+\s+[A-Z][a-z]+\s+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Court|Ct|Circle|Cir))'),
+    ('zip', r'\b\d{5}(?:-\d{4})?\b'),
+    ('url', r'https?://[^\s]+|www\.[^\s]+'),
+    ('profile', r'(?:linkedin\.com/in/|github\.com/|twitter\.com/|x\.com/)[^\s]+'),
+]
+_PII_RE = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in _PII_PATTERNS))
+_PII_MASKS = {
+    'email': '[EMAIL_MASKED]',
+    'phone': '[PHONE_MASKED]',
+    'address': '[ADDRESS_MASKED]',
+    'zip': '[ZIP_MASKED]',
+    'url': '[URL_MASKED]',
+    'profile': '[PROFILE_MASKED]',
+}
+
+
+def _pii_repl(match: "re.Match[str]") -> str:
+    """Return the mask token for whichever alternative matched."""
+    return _PII_MASKS[match.lastgroup]
+
+# Matches "2 years", "6 months", "1 year 3 months" in one pass; the flag
+# replaces the per-entry .lower() copy the old code made.
+_DURATION_RE = re.compile(r'(\d+)\s*(year|month)s?', re.IGNORECASE)
+
+# Education keyword -> rank, built once at import instead of per call.
+_EDU_HIERARCHY = {
+    'phd': 5, 'doctoral': 5, 'doctorate': 5,
+    'master': 4, 'ms': 4, 'mba': 4, 'ma': 4,
+    'bachelor': 3, 'bs': 3, 'ba': 3, 'bsc': 3,
+    'associate': 2,
+    'diploma': 1,
+}
+# Single alternation matching every keyword in one scan per degree string,
+# replacing 13 separate substring checks. Alternatives are ordered by
+# descending rank so that at any position the highest-ranked keyword wins
+# (e.g. "mba" is tried before "ba"); substring semantics are otherwise
+# unchanged from the old `key in degree_str` checks.
+_EDU_RE = re.compile('|'.join(
+    sorted(_EDU_HIERARCHY, key=_EDU_HIERARCHY.get, reverse=True)
+))
+_EDU_MAX_LEVEL = max(_EDU_HIERARCHY.values())
+
+# Sentinel for attribute-presence checks via getattr.
+_MISSING = object()
+
+# JD skill fields arrive as free-form delimited text; real postings separate
+# skills with semicolons, slashes, bullets and newlines as well as commas.
+_SKILL_SPLIT_RE = re.compile(r'[,;/\n•|]+')
+
+def _collect_resume_skills(resume: "ResumeStructuredData", skills: Set[str], lower: bool = False) -> None:
+    """Add stripped (optionally lowercased) resume skills into the given set."""
+    # The same skill often repeats across experience/internships/projects, so
+    # intern after the first strip: duplicate adds then dedupe on pointer
+    # equality instead of a character compare. The bound-method hoist saves an
+    # attribute lookup per token.
+    add = skills.add
+    intern = sys.intern
+
     # From experience
     for exp in resume.experience:
         for tech in exp.technologies_used:
-            skills.add(tech.item.strip())
-    
+            if tech.item:
+                item = tech.item.strip()
+                add(intern(item.lower() if lower else item))
+
     # From internships
-    for intern in resume.internships:
-        for tech in intern.tech_stack:
-            skills.add(tech.item.strip())
-    
+    for intern_entry in resume.internships:
+        for tech in intern_entry.tech_stack:
+            if tech.item:
+                item = tech.item.strip()
+                add(intern(item.lower() if lower else item))
+
     # From projects
     for project in resume.projects:
         for tech in project.tech_stack:
-            skills.add(tech.item.strip())
-    
-    return sorted(list(skills))
+            if tech.item:
+                item = tech.item.strip()
+                add(intern(item.lower() if lower else item))
+
+def _collect_jd_skills(jd: "JDStructuredData", skills: Set[str], lower: bool = False) -> None:
+    """Add stripped (optionally lowercased) JD skills into the given set."""
+    for field in (jd.required_qualifications.skills, jd.preferred_qualifications.skills):
+        for skill in _SKILL_SPLIT_RE.split(field):
+            skill = skill.strip()
+            if skill:
+                skills.add(skill.lower() if lower else skill)
+
+def extract_skills_from_resume(resume: "ResumeStructuredData") -> List[str]:
+    """Extract all technical skills from resume."""
+    skills = set()
+    _collect_resume_skills(resume, skills)
+    return sorted(skills)
 
-def extract_skills_from_jd(jd: JDStructuredData) -> List[str]:
+def extract_skills_from_jd(jd: "JDStructuredData") -> List[str]:
     """Extract required and preferred skills from JD."""
     skills = set()
-    
-    # Parse skills from requirements
-    req_skills = jd.required_qualifications.skills.split(',')
-    for skill in req_skills:
-        if skill.strip():
-            skills.add(skill.strip())
-    
-    # Parse skills from preferred qualifications
-    pref_skills = jd.preferred_qualifications.skills.split(',')
-    for skill in pref_skills:
-        if skill.strip():
-            skills.add(skill.strip())
-    
-    return sorted(list(skills))
+    _collect_jd_skills(jd, skills)
+    return sorted(skills)
 
-def find_missing_skills(resume: ResumeStructuredData, jd: JDStructuredData) -> List[str]:
+def find_missing_skills(resume: "ResumeStructuredData", jd: "JDStructuredData") -> List[str]:
     """Find skills present in JD but missing from resume."""
-    resume_skills = set(s.lower() for s in extract_skills_from_resume(resume))
-    jd_skills = set(s.lower() for s in extract_skills_from_jd(jd))
-    
-    missing = jd_skills - resume_skills
-    return sorted(list(missing))
+    # Fold to lowercase while collecting, instead of sorting each set into a
+    # list only to lowercase every element into a fresh set.
+    resume_skills: Set[str] = set()
+    jd_skills: Set[str] = set()
+    _collect_resume_skills(resume, resume_skills, lower=True)
+    _collect_jd_skills(jd, jd_skills, lower=True)
+
+    return sorted(jd_skills - resume_skills)
 
-def calculate_experience_years(resume: ResumeStructuredData) -> float:
+def calculate_experience_years(resume: "ResumeStructuredData") -> float:
     """Calculate total years of professional experience."""
-    import re
     total_months = 0
-    
+
     for exp in resume.experience:
         # Parse duration string (e.g., "2 years", "6 months", "1 year 3 months")
-        duration = exp.duration.lower()
-        
-        if 'year' in duration:
-            year_match = re.search(r'(\d+)\s*year', duration)
-            if year_match:
-                years = int(year_match.group(1))
-                total_months += years * 12
-        
-        if 'month' in duration:
-            month_match = re.search(r'(\d+)\s*month', duration)
-            if month_match:
-                months = int(month_match.group(1))
-                total_months += months
-    
+        # in a single case-insensitive scan.
+        for count, unit in _DURATION_RE.findall(exp.duration):
+            total_months += int(count) * (12 if unit[0] in 'yY' else 1)
+
     return round(total_months / 12, 1) if total_months > 0 else 0.0
 
-def extract_education_level(resume: ResumeStructuredData) -> str:
+def extract_education_level(resume: "ResumeStructuredData") -> str:
     """Get highest education level."""
-    education_hierarchy = {
-        'phd': 5, 'doctoral': 5, 'doctorate': 5,
-        'master': 4, 'ms': 4, 'mba': 4, 'ma': 4,
-        'bachelor': 3, 'bs': 3, 'ba': 3, 'bsc': 3,
-        'associate': 2,
-        'diploma': 1
-    }
-    
     highest = ('None', 0)
-    
+
     for edu in resume.education:
         for degree in edu.degree:
-            degree_str = degree.item.lower()
-            for key, level in education_hierarchy.items():
-                if key in degree_str and level > highest[1]:
+            for match in _EDU_RE.finditer(degree.item.lower()):
+                level = _EDU_HIERARCHY[match.group()]
+                if level > highest[1]:
+                    # Level 5 is the top of the hierarchy; nothing later can
+                    # outrank it, so stop scanning the remaining degrees.
+                    if level == _EDU_MAX_LEVEL:
+                        return degree.item
                     highest = (degree.item, level)
-    
+
     return highest[0]
 
-def format_resume_summary(resume: ResumeStructuredData) -> dict:
+def _analyze_resume(resume: "ResumeStructuredData") -> tuple:
+    """
+    Single-pass resume analysis: skills, experience years, and education level.
+
+    Walks each of resume.experience / internships / projects / education
+    exactly once, instead of the three independent traversals that calling
+    extract_skills_from_resume, calculate_experience_years and
+    extract_education_level separately would make.
+    """
+    skills = set()
+    total_months = 0
+    highest = ('None', 0)
+
+    for exp in resume.experience:
+        for tech in exp.technologies_used:
+            skills.add(tech.item.strip())
+        for count, unit in _DURATION_RE.findall(exp.duration):
+            total_months += int(count) * (12 if unit[0] in 'yY' else 1)
+
+    for intern in resume.internships:
+        for tech in intern.tech_stack:
+            skills.add(tech.item.strip())
+
+    for project in resume.projects:
+        for tech in project.tech_stack:
+            skills.add(tech.item.strip())
+
+    for edu in resume.education:
+        if highest[1] == _EDU_MAX_LEVEL:
+            break
+        for degree in edu.degree:
+            for match in _EDU_RE.finditer(degree.item.lower()):
+                level = _EDU_HIERARCHY[match.group()]
+                if level > highest[1]:
+                    highest = (degree.item, level)
+
+    years = round(total_months / 12, 1) if total_months > 0 else 0.0
+    return sorted(skills), years, highest[0]
+
+def format_resume_summary(resume: "ResumeStructuredData") -> dict:
     """Create a formatted summary of resume for analysis."""
+    skills, experience_years, education_level = _analyze_resume(resume)
     return {
         "candidate_name": resume.contact_information.name,
         "current_title": resume.job_title,
-        "total_experience_years": calculate_experience_years(resume),
-        "education_level": extract_education_level(resume),
-        "technical_skills": extract_skills_from_resume(resume),
+        "total_experience_years": experience_years,
+        "education_level": education_level,
+        "technical_skills": skills,
         "total_projects": len(resume.projects),
         "certifications_count": len(resume.certifications),
         "has_internships": len(resume.internships) > 0,
         "summary": resume.summary
     }
 
-def format_jd_summary(jd: JDStructuredData) -> dict:
+def format_jd_summary(jd: "JDStructuredData") -> dict:
     """Create a formatted summary of JD for analysis."""
+    work_type = jd.work_type
     return {
         "role": jd.job_title,
         "locations": [loc.city for loc in jd.location],
         "job_type": jd.job_type,
-        "work_type": jd.work_type,
+        "work_type": work_type,
         "required_skills": extract_skills_from_jd(jd),
         "required_education": jd.required_qualifications.education,
         "required_experience": jd.required_qualifications.experience,
         "total_responsibilities": len(jd.job_duties),
         "salary_info": jd.other_information.salary if jd.other_information.salary else "Not specified",
-        "remote_friendly": "remote" in jd.work_type.lower()
+        "remote_friendly": "remote" in work_type.casefold()
     }
 
 
@@ -150,48 +255,33 @@ def mask_pii_data(text: str) -> str:
     
     if not text:
         return text
-    
-    # Mask email addresses
-    text = re.sub(
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        '[EMAIL_MASKED]',
-        text
-    )
-    
-    # Mask phone numbers (various formats)
-    text = re.sub(
-        r'(\+?1[-.\s]?)?(\([0-9]{3}\)|[0-9]{3})[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',
-        '[PHONE_MASKED]',
-        text
-    )
-    
-    # Mask US street addresses (pattern: number street)
-    text = re.sub(
-        r'\b\d+\s+[A-Z][a-z]+\s+(Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Court|Ct|Circle|Cir)',
-        '[ADDRESS_MASKED]',
-        text,
-        flags=re.IGNORECASE
-    )
-    
-    # Mask ZIP codes
-    text = re.sub(r'\b\d{5}(-\d{4})?\b', '[ZIP_MASKED]', text)
-    
-    # Mask URLs
-    text = re.sub(
-        r'https?://[^\s]+|www\.[^\s]+',
-        '[URL_MASKED]',
-        text
-    )
-    
-    # Mask LinkedIn, GitHub, and social media profiles
-    text = re.sub(
-        r'(?:linkedin\.com/in/|github\.com/|twitter\.com/|x\.com/)[^\s]+',
-        '[PROFILE_MASKED]',
-        text
-    )
-    
-    logger.debug("Successfully masked PII from text")
-    return text
+
+    # No per-call debug log here: this runs once per achievement/description
+    # and the logging call overhead is paid even when DEBUG is off.
+    return _PII_RE.sub(_pii_repl, text)
+
+
+# Separator for batch masking. The newlines stop the URL/profile patterns
+# ([^\s]+) at the boundary and \x1e (ASCII record separator) never appears in
+# resume text, so no PII pattern can match across it.
+_MASK_JOIN_SEP = "\n\x1e\n"
+
+
+def _mask_many(items: List[str]) -> List[str]:
+    """
+    Mask PII across a list of strings with one joined scan.
+
+    Joining amortizes the regex dispatch over the whole list instead of one
+    sub() call per string. Falls back to per-item masking if the separator
+    count changes (it cannot with the current patterns, but masking must
+    never drop an achievement).
+    """
+    if len(items) < 2:
+        return [mask_pii_data(item) for item in items]
+    parts = mask_pii_data(_MASK_JOIN_SEP.join(items)).split(_MASK_JOIN_SEP)
+    if len(parts) == len(items):
+        return parts
+    return [mask_pii_data(item) for item in items]
 
 
 def mask_resume_structured_data(resume) -> Dict[str, Any]:
@@ -240,7 +330,7 @@ def mask_resume_structured_data(resume) -> Dict[str, Any]:
                     "position": exp.position,
                     "duration": exp.duration,
                     "responsibilities": exp.responsibilities or [],
-                    "achievements": [mask_pii_data(ach) for ach in (exp.achievements or [])],
+                    "achievements": _mask_many(exp.achievements or []),
                     "technologies_used": exp.technologies_used or [],
                     "team_size_managed": exp.team_size_managed,
                     "employer": "[COMPANY_NAME_MASKED]",
@@ -258,28 +348,31 @@ def mask_resume_structured_data(resume) -> Dict[str, Any]:
                 }
                 for edu in (resume.education or [])
             ],
+            # getattr with a default is a plain lookup; the hasattr checks it
+            # replaces each cost a try/except AttributeError per project/cert.
             "projects": [
                 {
-                    "title": proj.title if hasattr(proj, 'title') else "Project",
-                    "description": mask_pii_data(proj.description) if hasattr(proj, 'description') and proj.description else "",
-                    "technologies_used": proj.technologies_used if hasattr(proj, 'technologies_used') else [],
-                    "achievements": [mask_pii_data(ach) for ach in (proj.achievements if hasattr(proj, 'achievements') and proj.achievements else [])],
-                    "project_url": "[URL_MASKED]" if hasattr(proj, 'project_url') and proj.project_url else None,
+                    "title": getattr(proj, 'title', "Project"),
+                    "description": mask_pii_data(description) if (description := getattr(proj, 'description', None)) else "",
+                    "technologies_used": getattr(proj, 'technologies_used', []),
+                    "achievements": _mask_many(getattr(proj, 'achievements', None) or []),
+                    "project_url": "[URL_MASKED]" if getattr(proj, 'project_url', None) else None,
                 }
                 for proj in (resume.projects or [])
             ],
             "certifications": [
                 {
                     "name": cert.name,
-                    "issuer": "[ISSUER_MASKED]" if hasattr(cert, 'issuer') else None,
-                    "issue_date": "[DATE_MASKED]" if hasattr(cert, 'issue_date') else None,
-                    "expiry_date": "[DATE_MASKED]" if hasattr(cert, 'expiry_date') else None,
+                    "issuer": "[ISSUER_MASKED]" if getattr(cert, 'issuer', _MISSING) is not _MISSING else None,
+                    "issue_date": "[DATE_MASKED]" if getattr(cert, 'issue_date', _MISSING) is not _MISSING else None,
+                    "expiry_date": "[DATE_MASKED]" if getattr(cert, 'expiry_date', _MISSING) is not _MISSING else None,
                 }
                 for cert in (resume.certifications or [])
             ],
         }
         
-        logger.debug("Successfully masked structured resume data for LLM API")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Successfully masked structured resume data for LLM API")
         return masked_data
         
     except Exception as e:
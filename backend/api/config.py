@@ -3,8 +3,11 @@ Configuration and settings for ResAlign AI backend.
 Loads from environment variables with sensible defaults.
 """
 
+from functools import lru_cache
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Tuple
 import os
 
 
@@ -21,14 +24,20 @@ class Settings(BaseSettings):
     PORT: int = int(os.getenv("PORT", "8000"))
 
     # === CORS ===
-    CORS_ALLOWED_ORIGINS: List[str] = [
+    # Tuple, not list: immutable, slightly smaller, and nothing should mutate
+    # the origin allowlist after startup.
+    CORS_ALLOWED_ORIGINS: Tuple[str, ...] = (
         "http://localhost:5173",  # Vite dev
         "http://localhost:3000",  # Alt dev
-    ]
+    )
 
-    # Try to load from env; add Client Origins URL if provided
-    if os.getenv("CLIENT_ORIGINS_URL"):
-        CORS_ALLOWED_ORIGINS.append(os.getenv("CLIENT_ORIGINS_URL"))
+    @model_validator(mode="after")
+    def _append_client_origin(self) -> "Settings":
+        """Add the deployed client origin from env, once at construction."""
+        url = os.getenv("CLIENT_ORIGINS_URL")
+        if url:
+            self.CORS_ALLOWED_ORIGINS = (*self.CORS_ALLOWED_ORIGINS, url)
+        return self
 
 
     # === Supabase ===
@@ -55,9 +64,29 @@ class Settings(BaseSettings):
         "USE_REDUCTO_EXTRACTION", "True"
     ).lower() == "true"
 
+    # Drop Field(description=...) strings from the extraction models at import.
+    # Safe for API workers that never feed the schemas to an LLM/OpenAPI doc;
+    # keeps the description text out of per-worker heap.
+    TRIM_SCHEMA_DESCRIPTIONS: bool = os.getenv(
+        "TRIM_SCHEMA_DESCRIPTIONS", "False"
+    ).lower() == "true"
+
+    # Skip the LLM fit-rationale call when the composite score is far below
+    # the NOT_FIT threshold; the deterministic fallback text covers those.
+    RATIONALE_SKIP_LLM_FOR_LOW_SCORE: bool = os.getenv(
+        "RATIONALE_SKIP_LLM_FOR_LOW_SCORE", "False"
+    ).lower() == "true"
+    RATIONALE_LLM_MIN_SCORE: float = float(os.getenv("RATIONALE_LLM_MIN_SCORE", "40"))
+
     class Config:
         env_file = ".env"
         case_sensitive = True
         extra = "ignore"
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Cached Settings accessor for callers that inject configuration."""
+    return Settings()
+
+
+settings = get_settings()
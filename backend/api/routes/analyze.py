@@ -5,24 +5,54 @@ import logging
 import json
 import asyncio
 import io
+
+import orjson
 from datetime import datetime, timezone
 from typing import AsyncGenerator, List, Any
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from sse_starlette.sse import EventSourceResponse
 from markitdown import MarkItDown
 
+from api.services.cache import analysis_cache, markdown_cache
 from api.services.supabase import get_supabase_client
 from api.services.scorer import get_scoring_service
 from api.services.resume_recommendation_service import get_resume_recommendation_service
 from api.services.learning_resource_service import get_learning_resource_service
 from api.services.fit_rationale_service import get_fit_rationale_service
-from api._types import ResumeStructuredData, JDStructuredData
+from api._types import get_resume_adapter, get_jd_adapter
 from api.types.analysis import AnalyzeRequestParams
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["Analysis"])
 
 
+def _progress_frame(stage: str, progress: int, message: str) -> str:
+    """Build a serialized SSE progress payload; EventSourceResponse adds the framing."""
+    payload = {'event': 'progress', 'data': {'stage': stage, 'progress': progress, 'message': message}}
+    return orjson.dumps(payload).decode()
+
+
+# Progress frames are fully static, so serialize them once at import instead
+# of rebuilding dict + JSON + f-string on every request.
+_STAGE_STARTING = _progress_frame('starting_analysis', 30, 'Starting Analysis')
+_STAGE_SCORING = _progress_frame('calculating_scores', 60, 'Calculating Scores')
+_STAGE_FIT = _progress_frame('assessing_job_fit', 65, 'Assessing Job Fit')
+_STAGE_RECOMMENDATIONS = _progress_frame('generating_recommendations', 80, 'Generating Personalized Recommendations')
+_STAGE_SAVING = _progress_frame('saving', 90, 'Saving Results')
+_DONE = "[DONE]"
+
+# MarkItDown holds no per-request state, so build one converter at import
+# instead of per analysis.
+_MARKDOWN_CONVERTER = MarkItDown(enable_plugins=False)
+
+# Partial-completion frames emitted as each parallel LLM task finishes.
+_PARTIAL_FRAMES = {
+    'recommendations': _progress_frame('generating_recommendations', 84, 'Resume recommendations ready'),
+    'learning_resources': _progress_frame('generating_recommendations', 84, 'Learning resources ready'),
+    'fit_rationale': _progress_frame('generating_recommendations', 84, 'Job fit assessment ready'),
+}
+
+
 @router.post("/analyze")
 async def analyze_sse_stream(
     params: AnalyzeRequestParams = Depends()
@@ -52,15 +82,30 @@ async def analyze_sse_stream(
         """Generate SSE formatted progress updates."""
         analysis_id = None
         
+        cache_key = (user_id, params.resume_db_id, params.jd_db_id)
+
         try:
-            # Check if analysis already exists and is completed
+            # Served from the in-process cache: no DB round-trip at all for
+            # repeat views of a completed analysis.
+            cached_complete = analysis_cache.get(cache_key)
+            if cached_complete is not None:
+                yield orjson.dumps(cached_complete).decode()
+                yield _DONE
+                return
+
+            # Check if a completed analysis already exists. Filter on status
+            # server-side and fetch only the columns the reply needs, one row
+            # at most, instead of pulling every historical run for this pair.
             existing_analyses = await supabase.select(
                 table="analyses",
                 query_filter={
                     "resume_id": params.resume_db_id,
                     "jd_id": params.jd_db_id,
-                    "user_id": user_id
-                }
+                    "user_id": user_id,
+                    "status": "completed"
+                },
+                columns="id,status,report",
+                limit=1
             )
             
             if existing_analyses:
@@ -83,12 +128,13 @@ async def analyze_sse_stream(
                             "message": "Analysis complete!"
                         }
                     }
-                    yield f"data: {json.dumps(complete_data)}\n\n"
-                    yield "data: [DONE]\n\n"
+                    analysis_cache.set(cache_key, complete_data)
+                    yield orjson.dumps(complete_data).decode()
+                    yield _DONE
                     return
             
             # ===== STAGE 1 (30%): "Starting Analysis" =====
-            yield f"data: {json.dumps({'event': 'progress', 'data': {'stage': 'starting_analysis', 'progress': 30, 'message': 'Starting Analysis'}})}\n\n"
+            yield _STAGE_STARTING
             
             logger.info(f"Creating analysis record for user: {user_id}")
             
@@ -112,16 +158,19 @@ async def analyze_sse_stream(
             # Fetch resume and JD from database
             logger.info(f"Fetching resume and JD data for analysis")
             
-            resumes = await supabase.select(
-                table="resumes",
-                query_filter={"id": params.resume_db_id, "user_id": user_id}
-            )
-            
-            jds = await supabase.select(
-                table="job_descriptions",
-                query_filter={"id": params.jd_db_id, "user_id": user_id}
+            # Two independent PostgREST round-trips; overlap them instead of
+            # paying the latencies back to back.
+            resumes, jds = await asyncio.gather(
+                supabase.select(
+                    table="resumes",
+                    query_filter={"id": params.resume_db_id, "user_id": user_id}
+                ),
+                supabase.select(
+                    table="job_descriptions",
+                    query_filter={"id": params.jd_db_id, "user_id": user_id}
+                ),
             )
-            
+
             if not resumes or not jds:
                 raise Exception("Resume or JD not found in database")
             
@@ -130,22 +179,37 @@ async def analyze_sse_stream(
             jd_data = jds[0].get("extracted_data", {})
             resume_storage_path = resumes[0].get("supabase_storage_path")
             
-            resume = ResumeStructuredData(**resume_data)
-            jd = JDStructuredData(**jd_data)
+            # The two trees are independent, so validate them concurrently off
+            # the event loop instead of serially blocking it.
+            resume, jd = await asyncio.gather(
+                asyncio.to_thread(get_resume_adapter().validate_python, resume_data),
+                asyncio.to_thread(get_jd_adapter().validate_python, jd_data),
+            )
             
             logger.info("Resume and JD data loaded successfully")
             
             # Download and convert resume to markdown for recommendation service
             resume_markdown = ""
             try:
-                if resume_storage_path:
+                cached_markdown = markdown_cache.get(params.resume_db_id)
+                if cached_markdown is not None:
+                    # Same resume analyzed against another JD: the markdown is
+                    # a pure function of the uploaded bytes, so skip the
+                    # storage download and the PDF parse.
+                    resume_markdown = cached_markdown
+                    logger.info(f"Resume markdown served from cache: {len(resume_markdown)} characters")
+                elif resume_storage_path:
                     logger.info(f"Downloading resume file from storage: {resume_storage_path}")
                     resume_bytes = await supabase.download_file(resume_storage_path)
-                    
-                    # Convert to markdown using MarkItDown
-                    md = MarkItDown(enable_plugins=False)
-                    result = md.convert(io.BytesIO(resume_bytes))
+
+                    # Convert to markdown off the event loop: the PDF parse
+                    # can take hundreds of ms and would otherwise starve
+                    # every concurrent SSE stream.
+                    result = await asyncio.to_thread(
+                        _MARKDOWN_CONVERTER.convert, io.BytesIO(resume_bytes)
+                    )
                     resume_markdown = result.text_content
+                    markdown_cache.set(params.resume_db_id, resume_markdown)
                     logger.info(f"Resume converted to markdown: {len(resume_markdown)} characters")
                 else:
                     logger.warning("No resume storage path found, proceeding without markdown")
@@ -153,10 +217,8 @@ async def analyze_sse_stream(
                 logger.warning(f"Failed to convert resume to markdown (non-blocking): {str(md_error)}")
                 # Continue without markdown - structured data is still available
             
-            await asyncio.sleep(0.3)
-            
             # ===== STAGE 2 (60%): "Calculating Scores" =====
-            yield f"data: {json.dumps({'event': 'progress', 'data': {'stage': 'calculating_scores', 'progress': 60, 'message': 'Calculating Scores'}})}\n\n"
+            yield _STAGE_SCORING
             
             logger.info("Calculating category scores")
             scores = scorer.calculate_scores(resume, jd)
@@ -167,41 +229,39 @@ async def analyze_sse_stream(
             match_details = scorer.get_match_details(resume, jd)
             
             logger.info(f"Scores calculated: overall={overall_score:.1f}, fit={fit_classification.value}")
-            await asyncio.sleep(0.3)
-            
             # ===== STAGE 3 (65%): "Assessing Job Fit" =====
-            yield f"data: {json.dumps({'event': 'progress', 'data': {'stage': 'assessing_job_fit', 'progress': 65, 'message': 'Assessing Job Fit'}})}\n\n"
-            
-            # Generate fit rationale first (needed by recommendation service)
-            fit_rationale = ""
-            try:
-                logger.info("Generating fit rationale with LLM")
-                fit_rationale_service = get_fit_rationale_service()
-                fit_rationale = fit_rationale_service.generate_rationale(
-                    resume=resume,
-                    jd=jd,
-                    scores=scores,
-                    match_details=match_details,
-                    overall_score=overall_score,
-                    fit_classification=fit_classification.value
-                )
-                logger.info(f"Fit rationale generated: {len(fit_rationale)} characters")
-            except Exception as rationale_error:
-                logger.warning(f"Fit rationale generation failed (non-blocking): {str(rationale_error)}")
-            
-            await asyncio.sleep(0.3)
+            yield _STAGE_FIT
             
             # ===== STAGE 4 (80%): "Generating Personalized Recommendations" =====
-            yield f"data: {json.dumps({'event': 'progress', 'data': {'stage': 'generating_recommendations', 'progress': 80, 'message': 'Generating Personalized Recommendations'}})}\n\n"
-            
-            # Run resume recommendations and learning resources in parallel
+            yield _STAGE_RECOMMENDATIONS
+
+            # Run fit rationale, resume recommendations and learning resources
+            # in parallel. The rationale only depends on scores/match_details,
+            # already computed above; waiting for it before launching the
+            # other two LLM calls just serialized two slow calls behind a
+            # third. Recommendations are generated without the rationale text
+            # (the same input they already got whenever rationale generation
+            # failed).
+            fit_rationale = ""
             recommendations_text: List[str] = []
             learning_resources: List[Any] = []
-            
+
             try:
-                logger.info("Generating resume recommendations and learning resources in parallel")
-                
+                logger.info("Generating fit rationale, resume recommendations and learning resources in parallel")
+
                 # Define async tasks that wrap blocking LLM calls
+                async def get_fit_rationale():
+                    # The service offloads its blocking LLM call internally
+                    fit_rationale_service = get_fit_rationale_service()
+                    return await fit_rationale_service.generate_rationale(
+                        resume=resume,
+                        jd=jd,
+                        scores=scores,
+                        match_details=match_details,
+                        overall_score=overall_score,
+                        fit_classification=fit_classification.value
+                    )
+
                 async def get_resume_recommendations():
                     # Wrap the blocking LLM call in a thread pool
                     resume_rec_service = get_resume_recommendation_service()
@@ -210,17 +270,16 @@ async def analyze_sse_stream(
                         resume_markdown=resume_markdown or "Resume content not available in markdown format",
                         resume=resume,
                         jd=jd,
-                        fit_rationale=fit_rationale,
+                        fit_rationale="",
                         scores=scores,
                         overall_score=overall_score,
                         fit_classification=fit_classification.value
                     )
-                
+
                 async def get_learning_resources():
-                    # Wrap the blocking LLM call in a thread pool
+                    # The service runs its blocking LLM call in a worker thread
                     learning_res_service = get_learning_resource_service()
-                    return await asyncio.to_thread(
-                        learning_res_service.generate_resources,
+                    return await learning_res_service.generate_resources(
                         resume=resume,
                         jd=jd,
                         scores=scores,
@@ -229,13 +288,31 @@ async def analyze_sse_stream(
                         fit_classification=fit_classification.value
                     )
                 
-                # Run both in parallel
-                results = await asyncio.gather(
-                    get_resume_recommendations(),
-                    get_learning_resources(),
-                    return_exceptions=True
-                )
-                
+                # Run all three in parallel, emitting a progress frame as
+                # each finishes instead of staying silent until the slowest
+                # one completes.
+                tasks = {
+                    asyncio.create_task(get_resume_recommendations()): "recommendations",
+                    asyncio.create_task(get_learning_resources()): "learning_resources",
+                    asyncio.create_task(get_fit_rationale()): "fit_rationale",
+                }
+                ordered_tasks = list(tasks)
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield _PARTIAL_FRAMES[tasks[task]]
+
+                results = [
+                    task.exception() or task.result() for task in ordered_tasks
+                ]
+
+                if not isinstance(results[2], Exception) and results[2]:
+                    fit_rationale = results[2]
+                    logger.info(f"Fit rationale generated: {len(fit_rationale)} characters")
+                else:
+                    logger.warning(f"Fit rationale generation failed (non-blocking): {str(results[2]) if isinstance(results[2], Exception) else 'None returned'}")
+
                 # Extract results - ensure we always have valid lists
                 if not isinstance(results[0], Exception) and results[0] is not None:
                     recommendations_text = results[0] if isinstance(results[0], list) else []
@@ -257,14 +334,14 @@ async def analyze_sse_stream(
                 recommendations_text = []
                 learning_resources = []
             
-            await asyncio.sleep(0.3)
-            
             # ===== STAGE 5 (90%): "Saving Results" =====
-            yield f"data: {json.dumps({'event': 'progress', 'data': {'stage': 'saving', 'progress': 90, 'message': 'Saving Results'}})}\n\n"
+            yield _STAGE_SAVING
             
             logger.info(f"Updating analysis record: {analysis_id}")
             
-            # Build report JSON
+            # Build report JSON once; the SSE complete payload below reuses
+            # it instead of re-serializing every learning resource a second
+            # time.
             report = {
                 "overall_score": overall_score,
                 "fit_classification": fit_classification.value,
@@ -305,35 +382,23 @@ async def analyze_sse_stream(
                 "event": "complete",
                 "data": {
                     "analysis_id": analysis_id,
-                    "overall_score": overall_score,
-                    "fit_classification": fit_classification.value,
-                    "fit_rationale": fit_rationale,
-                    "category_scores": {
-                        cat: score for cat, score in scores.items()
-                        if cat != "overall_score"
-                    },
-                    "recommendations": recommendations_text if recommendations_text else [],
-                    "learning_resources": [
-                        lr.model_dump() if hasattr(lr, 'model_dump') else {
-                            "title": getattr(lr, 'title', 'Unknown'),
-                            "description": getattr(lr, 'description', ''),
-                            "category": getattr(lr, 'category', 'technical_skills'),
-                            "resource_type": getattr(lr, 'resource_type', 'course'),
-                            "url": getattr(lr, 'url', ''),
-                            "estimated_hours": getattr(lr, 'estimated_hours', 0)
-                        }
-                        for lr in (learning_resources if learning_resources else [])
-                    ],
+                    **report,
                     "progress": 100,
                     "message": "Analysis complete!"
                 }
             }
             
+            # Write through so re-opening this report skips the DB lookup.
+            analysis_cache.set(cache_key, complete_data)
+
             logger.info(f"Sending complete event with {len(recommendations_text)} recommendations and {len(learning_resources)} learning resources")
-            logger.debug(f"Complete event data: {json.dumps(complete_data, indent=2)[:500]}...")  # Log first 500 chars
+            if logger.isEnabledFor(logging.DEBUG):
+                # Guarded: the f-string would serialize the full payload even
+                # when DEBUG is off.
+                logger.debug(f"Complete event data: {json.dumps(complete_data, indent=2)[:500]}...")  # Log first 500 chars
             
-            yield f"data: {json.dumps(complete_data)}\n\n"
-            yield "data: [DONE]\n\n"
+            yield orjson.dumps(complete_data).decode()
+            yield _DONE
             
         except Exception as e:
             logger.error(f"Analysis failed: {str(e)}", exc_info=True)
@@ -356,15 +421,10 @@ async def analyze_sse_stream(
                     "message": "Analysis failed. Please try again."
                 }
             }
-            yield f"data: {json.dumps(error_data)}\n\n"
-            yield "data: [DONE]\n\n"
+            yield orjson.dumps(error_data).decode()
+            yield _DONE
     
-    return StreamingResponse(
-        generate_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        }
-    )
\ No newline at end of file
+    # EventSourceResponse handles SSE framing, sets the no-cache /
+    # no-buffering headers itself, and sends comment pings so proxies do not
+    # drop the connection during long LLM stages.
+    return EventSourceResponse(generate_stream(), ping=15)
\ No newline at end of file
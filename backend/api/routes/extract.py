@@ -2,6 +2,7 @@ import logging
 import asyncio
 
 from fastapi import APIRouter, HTTPException, Depends
+from api.services.cache import extraction_cache
 from api.services.reducto import get_reducto_client, ReductoClient
 from api.services.supabase import get_supabase_client, SupabaseClient
 from api.types.extraction import ExtractRequestParams, ExtractionResponse
@@ -55,15 +56,26 @@ async def extract_data_from_resume_and_jd(
         
         # Extraction timeout in seconds
         EXTRACTION_TIMEOUT = 120
-        
+
+        async def extract_with_cache(file_id, extract_coro):
+            """Serve a repeated extraction for the same upload from cache."""
+            cached = extraction_cache.get(file_id)
+            if cached is not None:
+                extract_coro.close()
+                logger.info(f"Reducto extraction served from cache for file: {file_id}")
+                return cached
+            result = await asyncio.wait_for(extract_coro, timeout=EXTRACTION_TIMEOUT)
+            extraction_cache.set(file_id, result)
+            return result
+
         extraction_tasks = [
-            asyncio.wait_for(
+            extract_with_cache(
+                resume_upload.file_id,
                 reducto.parse_and_extract_from_resume(resume_upload),
-                timeout=EXTRACTION_TIMEOUT
             ),
-            asyncio.wait_for(
+            extract_with_cache(
+                jd_upload.file_id,
                 reducto.parse_and_extract_from_jd(jd_upload),
-                timeout=EXTRACTION_TIMEOUT
             ),
         ]
         
@@ -91,28 +103,29 @@ async def extract_data_from_resume_and_jd(
         try:
             logger.info(f"Storing extracted data in Supabase for user: {params.user_id}")
             
-            # Store resume data with Supabase storage path
-            resume_record = await supabase.insert(
-                table="resumes",
-                data={
-                    "user_id": params.user_id,
-                    "reducto_file_id": params.resume_upload.file_id,
-                    "supabase_storage_path": params.resume_storage_path,
-                    "extracted_data": extracted_resume_data,
-                }
+            # The two inserts hit different tables and are independent, so
+            # run them concurrently and pay one round-trip instead of two.
+            resume_record, jd_record = await asyncio.gather(
+                supabase.insert(
+                    table="resumes",
+                    data={
+                        "user_id": params.user_id,
+                        "reducto_file_id": params.resume_upload.file_id,
+                        "supabase_storage_path": params.resume_storage_path,
+                        "extracted_data": extracted_resume_data,
+                    }
+                ),
+                supabase.insert(
+                    table="job_descriptions",
+                    data={
+                        "user_id": params.user_id,
+                        "reducto_file_id": params.jd_upload.file_id,
+                        "supabase_storage_path": params.jd_storage_path,
+                        "extracted_data": extracted_jd_data,
+                    }
+                ),
             )
             resume_db_id = resume_record.get("id")
-            
-            # Store JD data with Supabase storage path
-            jd_record = await supabase.insert(
-                table="job_descriptions",
-                data={
-                    "user_id": params.user_id,
-                    "reducto_file_id": params.jd_upload.file_id,
-                    "supabase_storage_path": params.jd_storage_path,
-                    "extracted_data": extracted_jd_data,
-                }
-            )
             jd_db_id = jd_record.get("id")
             
             logger.info(
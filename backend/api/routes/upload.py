@@ -6,8 +6,6 @@ Handles file uploads, directory structure creation, and data extraction.
 import asyncio
 import logging
 import uuid
-from datetime import datetime, timezone
-from annotated_types import Timezone
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
 from fastapi.responses import JSONResponse
 
@@ -61,14 +59,15 @@ async def upload_resume_and_jd(
     try:
         logger.info(f"Upload request from user: {params.user_id}")
 
-        # Buffer files to enable parallel uploads
+        # Buffer files to enable parallel uploads. Each file is read into a
+        # single immutable bytes object shared by both its uploaders, so
+        # there is one copy per file regardless of destination count; the
+        # two reads themselves are independent, so overlap them.
         logger.info(f"Buffering files for parallel upload: {params.user_id}")
-        resume_bytes = await params.resume_file.read()
-        jd_bytes = await params.jd_file.read()
-
-        # Reset file pointers for any additional processing
-        await params.resume_file.seek(0)
-        await params.jd_file.seek(0)
+        resume_bytes, jd_bytes = await asyncio.gather(
+            params.resume_file.read(),
+            params.jd_file.read(),
+        )
 
         # Run all uploads concurrently to minimize latency
         logger.info(f"Starting parallel uploads for user: {params.user_id}")
@@ -113,24 +112,21 @@ async def upload_resume_and_jd(
             logger.error(f"Upload failures for user {params.user_id}: {error_msg}")
             raise HTTPException(status_code=500, detail=f"Upload failed: {error_msg}")
 
-        logger.info(
-            f"\n\n*********************Reducto Upload Results*********************\n"
-            f"\nSuccessfully uploaded files for user {params.user_id}: \n"
-            f"\nResume file_id ===> {reducto_resume_upload.file_id}\n"
-            f"\nJD file_id     ===> {reducto_jd_upload.file_id}\n"
-            f"\n******************End of Reducto Upload Results*****************\n\n"
-            
-            f"\n\n*********************Supabase Upload Results*********************\n"
-            f"\nSuccessfully uploaded files for user {params.user_id}: \n"
-            f"\nResume path ===> {params.user_id}/resumes/{params.resume_file.filename}\n"
-            f"\nJD path     ===> {params.user_id}/jds/{params.jd_file.filename}\n"
-            f"\n******************End of Supabase Upload Results*****************\n\n"
-        )
-
         # Use the known storage paths (files are uploaded with predictable paths)
         resume_storage_path = f"{params.user_id}/resumes/{params.resume_file.filename}"
         jd_storage_path = f"{params.user_id}/jds/{params.jd_file.filename}"
 
+        # %-style args are only formatted if the handler level lets the
+        # record through, unlike the old multi-line f-string banner.
+        logger.info(
+            "Uploads complete: user=%s resume_file_id=%s jd_file_id=%s resume_path=%s jd_path=%s",
+            params.user_id,
+            reducto_resume_upload.file_id,
+            reducto_jd_upload.file_id,
+            resume_storage_path,
+            jd_storage_path,
+        )
+
         # Return structured response
         return UploadResponse(
             success=True,
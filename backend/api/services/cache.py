@@ -0,0 +1,73 @@
+"""
+Lightweight in-process TTL caches for hot read paths.
+
+Single-worker-friendly stand-in for Redis: entries live in an OrderedDict
+with insertion-order eviction, so the cache stays bounded without a
+background sweeper. For multi-worker deployments each process keeps its own
+cache, which is acceptable for read-through use — a miss just falls back to
+the database.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded key/value cache where entries expire after a fixed TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if absent or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        cached_at, value = entry
+        if time.time() - cached_at > self._ttl:
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting oldest entries past maxsize."""
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+
+# Completed-analysis reports keyed by (user_id, resume_db_id, jd_db_id).
+# Re-opening a report is the most common analyze call; a hit skips the
+# Supabase round-trip entirely.
+analysis_cache = TTLCache(maxsize=10_000, ttl=3600)
+
+# Markdown conversions keyed by resume_db_id. The markdown is a pure function
+# of the uploaded bytes, so re-analyzing the same resume against another JD
+# skips the storage download and the PDF parse.
+markdown_cache = TTLCache(maxsize=1_000, ttl=3600)
+
+# Reducto extraction results keyed by uploaded file_id. A retried or
+# re-submitted /extract call for the same upload skips the multi-second
+# external parse (and its API cost) entirely.
+extraction_cache = TTLCache(maxsize=500, ttl=3600)
+
+# Generated fit rationales keyed by a digest of the prompt inputs. Identical
+# structured data and scores produce an identical prompt, so a repeat is a
+# zero-token hit instead of a Gemini round-trip. Day-long TTL: the rationale
+# is a pure function of its inputs, not of time.
+rationale_cache = TTLCache(maxsize=2_000, ttl=86_400)
+
+# Curated learning resources keyed by a digest of the prompt inputs. Within
+# a short window, identical inputs yield near-identical curation, and users
+# retry; the short TTL keeps the underlying web-search results fresh.
+learning_resource_cache = TTLCache(maxsize=512, ttl=1800)
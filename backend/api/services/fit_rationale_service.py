@@ -3,15 +3,68 @@ Fit rationale service for generating AI-powered explanations of candidate fit.
 Uses LLM to generate personalized rationales based on scoring analysis.
 """
 
+import asyncio
+import hashlib
 import logging
-import json
-from typing import Dict, Any
+import string
+import time
+import weakref
+from typing import Dict, Any, List
+
+import orjson
+from pydantic import BaseModel
+
+from api.config import settings
+from api.services.cache import rationale_cache
 from api.services.llm_service import Gemini
 from api._types import ResumeStructuredData, JDStructuredData
 from api._utils.extraction_helpers import mask_resume_structured_data, mask_pii_data
 
 logger = logging.getLogger(__name__)
 
+# Prompt summaries memoized per structured-data object. The summaries are
+# invariant for a given object, so evaluating one resume against many JDs
+# (or retrying) reuses them. Keyed by id() — the models hash by value and
+# their list fields make that unreliable — with a weakref finalizer
+# evicting each entry when its object is collected.
+_resume_summary_cache: Dict[int, tuple] = {}
+_jd_summary_cache: Dict[int, Dict[str, Any]] = {}
+
+
+def _join_items(items: Any, limit: int = 0) -> str:
+    """Render a list of strings as comma-joined plain text for the prompt.
+
+    str(list) embeds Python repr syntax — brackets and a pair of quotes per
+    item — which the tokenizer bills for and the model doesn't need. With a
+    `limit`, only the first `limit` items are emitted followed by a terse
+    "+N more" marker; a 300-500 word rationale can't cite 50 skills anyway.
+    """
+    if not items:
+        return "None"
+    if limit and len(items) > limit:
+        shown = ", ".join(str(item) for item in items[:limit])
+        return f"{shown} +{len(items) - limit} more"
+    return ", ".join(str(item) for item in items)
+
+
+class RationaleOut(BaseModel):
+    """Structured output schema for the rationale LLM call.
+
+    JSON mode constrains the model to this shape, so parsing never has to
+    strip markdown fences or retry on malformed prose.
+    """
+
+    rationale: str
+    strengths: List[str] = []
+    gaps: List[str] = []
+
+
+def _compact_dumps(obj: Any) -> str:
+    """Minified JSON for prompt embedding — indentation only inflates the
+    input token count the LLM is billed for. orjson serializes in C and
+    emits compact output by default."""
+    return orjson.dumps(obj).decode()
+
 
 class FitRationaleService:
     """Generate AI-powered fit rationale using LLM with cached system prompt."""
@@ -156,34 +209,56 @@ Your rationale should:
 
 Generate the fit rationale now:
 """
-    
+
+    # Template segments parsed once at import time. str.format re-tokenizes
+    # the multi-KB template string on every call; _fast_format walks these
+    # pre-parsed segments instead.
+    _TEMPLATE_PARSED = list(string.Formatter().parse(USER_PROMPT_TEMPLATE))
+
+    def _fast_format(self, fields: Dict[str, Any]) -> str:
+        """Render USER_PROMPT_TEMPLATE from its pre-parsed segments."""
+        parts = []
+        for literal, field, spec, _conversion in self._TEMPLATE_PARSED:
+            if literal:
+                parts.append(literal)
+            if field is not None:
+                parts.append(format(fields[field], spec))
+        return "".join(parts)
+
     def __init__(self):
         """Initialize fit rationale service with LLM client."""
-        from api.config import settings
         self.llm = Gemini(model=settings.LLM_MODEL, api_key=settings.GEMINI_API_KEY)
         self.cache_created = False
+        self.cache_expires_at = 0.0
         logger.info(f"FitRationaleService initialized with model: {settings.LLM_MODEL}")
-    
+
+    # Server-side TTL for the cached system prompt
+    CACHE_TTL_HOURS = 1
+
     def _ensure_cache(self):
-        """Create cached content for system prompt if not already created."""
-        if not self.cache_created:
-            try:
-                cache_id = self.llm.create_cached_content(
-                    system_prompt=self.SYSTEM_PROMPT,
-                    ttl_hours=1  # Cache for 1 hour
-                )
-                if cache_id:
-                    self.cache_created = True
-                    logger.info("System prompt cached successfully")
-                else:
-                    # Prompt is too small for caching, will use regular generation
-                    self.cache_created = False
-                    logger.info("System prompt too small for caching, will use regular generation")
-            except Exception as e:
-                logger.warning(f"Failed to create cache, will use regular generation: {str(e)}")
+        """Create or refresh cached content for the system prompt."""
+        if self.cache_created and time.time() < self.cache_expires_at:
+            return
+        try:
+            cache_id = self.llm.create_cached_content(
+                system_prompt=self.SYSTEM_PROMPT,
+                ttl_hours=self.CACHE_TTL_HOURS,
+            )
+            if cache_id:
+                self.cache_created = True
+                # Recreate 60s before the server-side TTL lapses so no
+                # request runs against an expired cache name.
+                self.cache_expires_at = time.time() + self.CACHE_TTL_HOURS * 3600 - 60
+                logger.info("System prompt cached successfully")
+            else:
+                # Prompt is too small for caching, will use regular generation
                 self.cache_created = False
+                logger.info("System prompt too small for caching, will use regular generation")
+        except Exception as e:
+            logger.warning(f"Failed to create cache, will use regular generation: {str(e)}")
+            self.cache_created = False
     
-    def generate_rationale(
+    async def generate_rationale(
         self,
         resume: ResumeStructuredData,
         jd: JDStructuredData,
@@ -193,8 +268,12 @@ Generate the fit rationale now:
         fit_classification: str
     ) -> str:
         """
-        Generate fit rationale using LLM.
-        
+        Generate fit rationale using LLM without blocking the event loop.
+
+        The Gemini SDK call is synchronous, so it runs in a worker thread;
+        awaiting this coroutine keeps concurrent requests flowing while the
+        round-trip is in flight.
+
         Args:
             resume: Structured resume data
             jd: Structured job description data
@@ -206,31 +285,109 @@ Generate the fit rationale now:
         Returns:
             str: Generated fit rationale (300-500 words)
         """
-        try:
-            # Prepare resume summary with PII masked
-            resume_summary = {
-                "name": "[CANDIDATE_MASKED]",
-                "current_title": resume.job_title or "Not specified",
-                "total_experience_years": sum(exp.duration for exp in (resume.experience or [])),
-                "education_level": resume.education[0].degree if resume.education else "Not specified",
-                "technical_skills": (resume.technical_skills[:10] if resume.technical_skills else []),
-                "certifications_count": len(resume.certifications or []),
-                "projects_count": len(resume.projects or []),
-            }
-            
-            # Prepare JD summary
-            jd_summary = {
+        # Opt-in short-circuit: for scores far below the NOT_FIT threshold
+        # the deterministic fallback text is adequate, and the LLM round-trip
+        # is the dominant cost of this path.
+        if (
+            settings.RATIONALE_SKIP_LLM_FOR_LOW_SCORE
+            and overall_score < settings.RATIONALE_LLM_MIN_SCORE
+        ):
+            logger.info(
+                f"Skipping LLM rationale for low score {overall_score:.1f} "
+                f"(< {settings.RATIONALE_LLM_MIN_SCORE})"
+            )
+            return self._generate_fallback_rationale(overall_score, fit_classification)
+
+        return await asyncio.to_thread(
+            self._generate_rationale_sync,
+            resume, jd, scores, match_details, overall_score, fit_classification,
+        )
+
+    @staticmethod
+    def _build_resume_summary(resume: ResumeStructuredData) -> tuple:
+        """PII-masked resume overview for the prompt plus the management flag.
+
+        One pass over experience covers both the duration total and the
+        team-management check; the result is memoized per resume object.
+        """
+        hit = _resume_summary_cache.get(id(resume))
+        if hit is not None:
+            return hit
+
+        total_years = 0.0
+        has_mgmt = False
+        for exp in resume.experience or []:
+            total_years += exp.duration
+            if exp.team_size_managed > 0:
+                has_mgmt = True
+
+        summary = {
+            "name": "[CANDIDATE_MASKED]",
+            "current_title": resume.job_title or "Not specified",
+            "total_experience_years": total_years,
+            "education_level": resume.education[0].degree if resume.education else "Not specified",
+            "technical_skills": (resume.technical_skills[:10] if resume.technical_skills else []),
+            "certifications_count": len(resume.certifications or []),
+            "projects_count": len(resume.projects or []),
+        }
+        _resume_summary_cache[id(resume)] = (summary, has_mgmt)
+        weakref.finalize(resume, _resume_summary_cache.pop, id(resume), None)
+        return summary, has_mgmt
+
+    @staticmethod
+    def _build_jd_summary(jd: JDStructuredData) -> Dict[str, Any]:
+        """JD overview for the prompt, memoized per JD object."""
+        summary = _jd_summary_cache.get(id(jd))
+        if summary is None:
+            summary = {
                 "job_title": jd.job_title,
                 "company": jd.company_name,
                 "location": jd.location if jd.location else [],
                 "employment_type": jd.employment_type,
                 "location_type": jd.location_type,
-                "required_skills": (jd.required_qualifications.skills[:10] 
+                "required_skills": (jd.required_qualifications.skills[:10]
                                    if jd.required_qualifications.skills else []),
                 "required_education": jd.required_qualifications.education or "Not specified",
                 "required_experience": jd.required_qualifications.experience or "Not specified",
             }
+            _jd_summary_cache[id(jd)] = summary
+            weakref.finalize(jd, _jd_summary_cache.pop, id(jd), None)
+        return summary
+
+    def _generate_rationale_sync(
+        self,
+        resume: ResumeStructuredData,
+        jd: JDStructuredData,
+        scores: Dict[str, float],
+        match_details: Dict[str, Dict[str, Any]],
+        overall_score: float,
+        fit_classification: str
+    ) -> str:
+        """Blocking rationale generation; runs in a worker thread."""
+        try:
+            # Summaries are pure functions of the structured data; the
+            # builders memoize them per object.
+            resume_summary, has_mgmt = self._build_resume_summary(resume)
+            jd_summary = self._build_jd_summary(jd)
             
+            # Identical inputs produce an identical prompt and therefore an
+            # identical rationale; dedupe repeats before paying the LLM call.
+            # Score is bucketed to the nearest point so near-identical
+            # candidates collapse onto the same key.
+            cache_key = hashlib.blake2b(
+                orjson.dumps([
+                    resume_summary,
+                    jd_summary,
+                    match_details,
+                    round(overall_score),
+                    fit_classification,
+                ])
+            ).hexdigest()
+            cached = rationale_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Rationale cache hit; skipping LLM call")
+                return cached
+
             # Get detailed match info
             skills_match = match_details.get("skills_match", {})
             exp_match = match_details.get("experience_alignment", {})
@@ -239,15 +396,15 @@ Generate the fit rationale now:
             soft_match = match_details.get("soft_skills_and_culture", {})
             
             # Build user prompt with all data
-            user_prompt = self.USER_PROMPT_TEMPLATE.format(
+            user_prompt = self._fast_format(dict(
                 # Resume & JD summaries
-                resume_summary=json.dumps(resume_summary, indent=2),
-                jd_summary=json.dumps(jd_summary, indent=2),
+                resume_summary=_compact_dumps(resume_summary),
+                jd_summary=_compact_dumps(jd_summary),
                 
                 # Skills match details
                 skills_score=scores.get("skills_match", 0),
-                skills_matched_items=skills_match.get("matched_items", []),
-                skills_missing_required=skills_match.get("missing_required", []),
+                skills_matched_items=_join_items(skills_match.get("matched_items", []), limit=8),
+                skills_missing_required=_join_items(skills_match.get("missing_required", []), limit=8),
                 skills_matched=skills_match.get("matched", 0),
                 skills_total_required=skills_match.get("total_required", 1),
                 
@@ -268,37 +425,48 @@ Generate the fit rationale now:
                 # Achievements details
                 achievements_score=scores.get("achievements_and_outcomes", 0),
                 total_achievements=achieve_match.get("achievements_count", 0),
-                matched_achievement_keywords=achieve_match.get("matched_items", []),
+                matched_achievement_keywords=_join_items(achieve_match.get("matched_items", []), limit=6),
                 achievements_matched=achieve_match.get("matched", 0),
                 achievements_total_required=achieve_match.get("total_required", 1),
                 
                 # Soft skills details
                 soft_skills_score=scores.get("soft_skills_and_culture", 0),
-                soft_skills_matched_items=soft_match.get("matched_items", []),
-                has_leadership="Yes" if any(exp.team_size_managed > 0 for exp in (resume.experience or [])) else "No",
-                has_team_management="Yes" if any(exp.team_size_managed > 0 for exp in (resume.experience or [])) else "No",
+                soft_skills_matched_items=_join_items(soft_match.get("matched_items", []), limit=6),
+                has_leadership="Yes" if has_mgmt else "No",
+                has_team_management="Yes" if has_mgmt else "No",
                 
                 # Overall assessment
                 overall_score=overall_score,
                 fit_classification=fit_classification,
-            )
+            ))
             
             # Generate rationale using LLM with caching
             self._ensure_cache()
             
             if self.cache_created:
                 rationale, usage_metadata = self.llm.generate_response_with_cache(
-                    user_prompt=user_prompt
+                    user_prompt=user_prompt,
+                    response_schema=RationaleOut,
                 )
                 logger.info(f"Generated rationale using cached prompt. Usage: {usage_metadata}")
             else:
                 rationale, usage_metadata = self.llm.generate_response(
                     sys_prompt=self.SYSTEM_PROMPT,
-                    user_prompt=user_prompt
+                    user_prompt=user_prompt,
+                    response_schema=RationaleOut,
                 )
                 logger.info(f"Generated rationale without cache. Usage: {usage_metadata}")
-            
-            return rationale.strip()
+
+            # JSON mode pins the response to RationaleOut; keep the raw text
+            # if the model returned prose anyway.
+            try:
+                rationale = orjson.loads(rationale)["rationale"]
+            except (orjson.JSONDecodeError, KeyError, TypeError):
+                pass
+
+            rationale = rationale.strip()
+            rationale_cache.set(cache_key, rationale)
+            return rationale
         
         except Exception as e:
             logger.error(f"Failed to generate rationale: {str(e)}", exc_info=True)
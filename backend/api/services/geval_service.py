@@ -3,13 +3,32 @@ GEval scoring service using deepeval and OpenAI for structured resume-JD fit ass
 Provides per-category scores with reasoning.
 """
 
+import asyncio
+import itertools
 import logging
+from statistics import fmean
 from typing import Dict, Any, List
 from pydantic import BaseModel
 
+from api.config import settings
+
 logger = logging.getLogger(__name__)
 
 
+def _lowered_frozenset(extracted: Dict[str, Any], field: str) -> frozenset:
+    """Lowercased frozenset of extracted[field], memoized on the dict.
+
+    The same extracted dicts flow through every category scorer for a
+    candidate, so the set is built once per candidate instead of per call.
+    """
+    cache_key = f"_lowered_{field}_cache"
+    cached = extracted.get(cache_key)
+    if cached is None:
+        cached = frozenset(map(str.lower, extracted.get(field, ())))
+        extracted[cache_key] = cached
+    return cached
+
+
 class CategoryScore(BaseModel):
     """Score for a single category."""
 
@@ -34,6 +53,9 @@ class GevalService:
         "certifications",
     ]
 
+    # Max concurrent LLM category calls per service instance
+    LLM_CONCURRENCY = 5
+
     def __init__(self, openai_api_key: str, use_mock: bool = False):
         """
         Initialize GEval service.
@@ -45,6 +67,9 @@ class GevalService:
         self.openai_api_key = openai_api_key
         self.use_mock = use_mock
         self.model = "gpt-4o-mini"
+        # Throttle concurrent LLM category calls so a burst of analyses
+        # doesn't trip provider rate limits.
+        self._llm_semaphore = asyncio.Semaphore(self.LLM_CONCURRENCY)
         logger.info(f"GevalService initialized (mock={use_mock})")
 
     async def score_categories(
@@ -65,19 +90,26 @@ class GevalService:
             List of CategoryScore objects
         """
         try:
-            scores = []
-
-            for category in self.CATEGORIES:
-                if self.use_mock:
-                    score = self._score_category_mock(
-                        category, resume_extracted, jd_extracted
-                    )
-                else:
-                    score = await self._score_category_llm(
-                        category, resume_extracted, jd_extracted
-                    )
-
-                scores.append(score)
+            if self.use_mock:
+                scores = [
+                    self._score_category_mock(category, resume_extracted, jd_extracted)
+                    for category in self.CATEGORIES
+                ]
+            else:
+                # Each category score is independent; run the five LLM calls
+                # concurrently instead of serializing five round-trips.
+                results = await asyncio.gather(
+                    *(
+                        self._score_category_llm(category, resume_extracted, jd_extracted)
+                        for category in self.CATEGORIES
+                    ),
+                    return_exceptions=True,
+                )
+                scores = [
+                    result if not isinstance(result, Exception)
+                    else self._score_category_mock(category, resume_extracted, jd_extracted)
+                    for category, result in zip(self.CATEGORIES, results)
+                ]
 
             logger.info(
                 f"Scored {len(scores)} categories; avg score: "
@@ -111,21 +143,18 @@ class GevalService:
         base_score = 70
 
         if category == "technical_skills":
-            # Check if resume has skills
-            resume_skills = set(
-                s.lower() for s in resume_extracted.get("skills", [])
-            )
-            jd_reqs = set(
-                r.lower() for r in jd_extracted.get("requirements", [])
-            )
+            # Compute each set operation once instead of re-deriving the
+            # intersection for strengths; sets are memoized on the dicts.
+            resume_skills = _lowered_frozenset(resume_extracted, "skills")
+            jd_reqs = _lowered_frozenset(jd_extracted, "requirements")
 
-            # Count overlapping skills
-            overlap = len(resume_skills & jd_reqs)
+            matched = resume_skills & jd_reqs
+            missing = jd_reqs - resume_skills
             total_jd_reqs = max(len(jd_reqs), 1)
-            base_score = min(100, int(85 * (overlap / total_jd_reqs)))
+            base_score = min(100, int(85 * (len(matched) / total_jd_reqs)))
 
-            strengths = list(resume_skills & jd_reqs)[:3]
-            gaps = list(jd_reqs - resume_skills)[:3]
+            strengths = list(itertools.islice(matched, 3))
+            gaps = list(itertools.islice(missing, 3))
 
         elif category == "experience":
             # Check experience entries
@@ -179,10 +208,11 @@ class GevalService:
             CategoryScore with LLM reasoning
         """
         try:
-            # In production, would use deepeval GEval here
-            # For now, fall back to mock since deepeval requires setup
-            logger.debug(f"Using mock scoring (LLM not configured for {category})")
-            return self._score_category_mock(category, resume_extracted, jd_extracted)
+            async with self._llm_semaphore:
+                # In production, would use deepeval GEval here
+                # For now, fall back to mock since deepeval requires setup
+                logger.debug(f"Using mock scoring (LLM not configured for {category})")
+                return self._score_category_mock(category, resume_extracted, jd_extracted)
 
         except Exception as e:
             logger.error(f"LLM scoring failed for {category}: {str(e)}")
@@ -203,10 +233,9 @@ class GevalService:
         if not category_scores:
             return 0.0
 
-        # Equal weighting for now; in production would use dynamic weights
-        avg_score = sum(s.score for s in category_scores) / len(category_scores)
-
-        return avg_score
+        # Equal weighting for now; in production would use dynamic weights.
+        # fmean runs the reduction in C in one pass.
+        return fmean(s.score for s in category_scores)
 
     @staticmethod
     def classify_fit(composite_score: float) -> str:
@@ -245,8 +274,6 @@ def get_geval_service(use_mock: bool = True) -> GevalService:
     global _geval_service
 
     if _geval_service is None:
-        from api.config import settings
-
         _geval_service = GevalService(
             openai_api_key=settings.OPENAI_API_KEY,
             use_mock=use_mock,
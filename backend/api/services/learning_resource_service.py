@@ -3,16 +3,27 @@ Learning resource service for generating curated skill development recommendatio
 Uses LLM with web search to find real courses, certifications, and tutorials with actual URLs.
 """
 
+import asyncio
+import hashlib
 import logging
 import json
+import operator
+import re
+import string
 from typing import Dict, Any, List
-from pydantic import BaseModel
+
+import orjson
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from api.services.cache import learning_resource_cache
 from api.services.llm_service import Gemini
 from api._types import ResumeStructuredData, JDStructuredData
 from api._utils.extraction_helpers import mask_pii_data
 
 logger = logging.getLogger(__name__)
 
+# C-level attribute access for list projections
+_GET_NAME = operator.attrgetter("name")
+
 
 class LearningResource(BaseModel):
     """A learning resource recommendation with actual URL."""
@@ -25,6 +36,15 @@ class LearningResource(BaseModel):
     estimated_hours: int = 0
 
 
+# Markdown code fence around the whole response; group 1 is the payload.
+# One C-level match instead of splitting/rejoining every line.
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*\n(.*?)\n\s*```\s*$', re.DOTALL)
+
+# Validates a whole JSON array straight into models inside pydantic-core,
+# skipping the json.loads dict tree and the per-item Python constructor.
+_RESOURCE_LIST_ADAPTER = TypeAdapter(List[LearningResource])
+
+
 class LearningResourceService:
     """
     Generate curated learning resources with real URLs using LLM with web search.
@@ -77,22 +97,22 @@ Your role is to help candidates identify and acquire the skills they need to qua
 
 ### Current Skills & Experience:
 ```json
-{resume_summary}
+${resume_summary}
 ```
 
 ### Target Job Requirements:
 ```json
-{jd_summary}
+${jd_summary}
 ```
 
 ### Skill Gap Analysis:
 **Category Scores:**
-{category_scores_formatted}
+${category_scores_formatted}
 
 **Identified Gaps:**
-{skill_gaps}
+${skill_gaps}
 
-**Overall Fit:** {fit_classification} ({overall_score:.1f}/100)
+**Overall Fit:** ${fit_classification} (${overall_score}/100)
 
 ---
 
@@ -155,14 +175,18 @@ Return a JSON array of learning resources:
 
 Generate the curated learning resources now:
 """
-    
+
+    # Compiled once at class load; substitution is a single linear scan and
+    # the $-placeholders coexist with the JSON braces without escaping.
+    _USER_PROMPT_TMPL = string.Template(USER_PROMPT_TEMPLATE)
+
     def __init__(self):
         """Initialize learning resource service with LLM client (with Google Search enabled)."""
         from api.config import settings
         self.llm = Gemini(model=settings.LLM_MODEL, api_key=settings.GEMINI_API_KEY)
         logger.info(f"LearningResourceService initialized with model: {settings.LLM_MODEL}")
     
-    def generate_resources(
+    async def generate_resources(
         self,
         resume: ResumeStructuredData,
         jd: JDStructuredData,
@@ -172,8 +196,40 @@ Generate the curated learning resources now:
         fit_classification: str
     ) -> List[LearningResource]:
         """
-        Generate curated learning resources using LLM with web search.
-        
+        Generate curated learning resources without blocking the event loop.
+
+        The Gemini SDK call (which also performs web search) is synchronous
+        and multi-second; it runs in a worker thread so concurrent analyses
+        keep flowing while it's in flight.
+
+        Args:
+            resume: Structured resume data
+            jd: Structured job description data
+            scores: Category scores dict
+            match_details: Detailed match info from scoring service
+            overall_score: Weighted composite score
+            fit_classification: GOOD_FIT | PARTIAL_FIT | NOT_FIT
+
+        Returns:
+            List[LearningResource]: List of curated resources with real URLs
+        """
+        return await asyncio.to_thread(
+            self._generate_resources_sync,
+            resume, jd, scores, match_details, overall_score, fit_classification,
+        )
+
+    def _generate_resources_sync(
+        self,
+        resume: ResumeStructuredData,
+        jd: JDStructuredData,
+        scores: Dict[str, float],
+        match_details: Dict[str, Dict[str, Any]],
+        overall_score: float,
+        fit_classification: str
+    ) -> List[LearningResource]:
+        """
+        Blocking resource generation; runs in a worker thread.
+
         Args:
             resume: Structured resume data
             jd: Structured job description data
@@ -190,9 +246,9 @@ Generate the curated learning resources now:
             resume_summary = {
                 "name": "[CANDIDATE_MASKED]",
                 "current_title": resume.job_title or "Not specified",
-                "total_experience_years": sum(exp.duration for exp in (resume.experience or [])),
+                "total_experience_years": resume.total_experience_years,
                 "technical_skills": resume.technical_skills[:20] if resume.technical_skills else [],
-                "certifications": [cert.name for cert in (resume.certifications or [])],
+                "certifications": list(map(_GET_NAME, resume.certifications or ())),
                 "education": [
                     {"degree": edu.degree, "school": "[SCHOOL_MASKED]"}
                     for edu in (resume.education or [])
@@ -212,41 +268,64 @@ Generate the curated learning resources now:
                 "key_responsibilities": jd.job_duties[:5] if jd.job_duties else [],
             }
             
-            # Format category scores
-            category_scores_formatted = "\n".join([
-                f"- **{category.replace('_', ' ').title()}**: {score:.1f}/100"
-                for category, score in scores.items()
-                if category != "overall_score"
-            ])
-            
+            # Filter out overall_score and pre-format the block once; both
+            # the prompt and the gap analysis reuse the filtered items.
+            score_items, category_scores_formatted = self._prep_scores(scores)
+
+            # Within the cache TTL, identical inputs curate near-identical
+            # resources — dedupe retries before paying the Gemini plus
+            # web-search round-trip. Copies keep cached entries immutable.
+            cache_key = hashlib.blake2b(
+                orjson.dumps([
+                    resume_summary,
+                    jd_summary,
+                    sorted(scores.items()),
+                    fit_classification,
+                ])
+            ).hexdigest()
+            cached = learning_resource_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Learning resource cache hit; skipping LLM call")
+                return [resource.model_copy() for resource in cached]
+
             # Identify specific skill gaps
-            skill_gaps = self._identify_skill_gaps(resume, jd, scores, match_details)
+            skill_gaps = self._identify_skill_gaps(resume, jd, score_items, match_details)
             skill_gaps_formatted = "\n".join([f"- {gap}" for gap in skill_gaps])
             
-            # Build user prompt using replace to avoid conflicts with JSON braces
-            user_prompt = (
-                self.USER_PROMPT_TEMPLATE
-                .replace("{resume_summary}", json.dumps(resume_summary, indent=2))
-                .replace("{jd_summary}", json.dumps(jd_summary, indent=2))
-                .replace("{category_scores_formatted}", category_scores_formatted)
-                .replace("{skill_gaps}", skill_gaps_formatted)
-                .replace("{overall_score:.1f}", f"{overall_score:.1f}")
-                .replace("{fit_classification}", fit_classification)
+            # Substitute everything in one pass. orjson: C-level encoder,
+            # minified — indentation only inflates the prompt's token count.
+            user_prompt = self._USER_PROMPT_TMPL.safe_substitute(
+                resume_summary=orjson.dumps(resume_summary).decode(),
+                jd_summary=orjson.dumps(jd_summary).decode(),
+                category_scores_formatted=category_scores_formatted,
+                skill_gaps=skill_gaps_formatted,
+                overall_score=f"{overall_score:.1f}",
+                fit_classification=fit_classification,
             )
             
-            # Generate resources using LLM with Google Search
-            # Note: No caching for this service because web search results should be fresh
-            response_text, usage_metadata = self.llm.generate_response(
-                sys_prompt=self.SYSTEM_PROMPT,
-                user_prompt=user_prompt
-            )
+            # Generate resources using LLM with Google Search. The web-search
+            # freshness concern applies to the results, not to the static
+            # system instruction — that can ride the shared server-side
+            # cache instead of being re-sent (and re-billed) per request.
+            if self.llm.ensure_shared_cached_content(self.SYSTEM_PROMPT):
+                response_text, usage_metadata = self.llm.generate_response_with_cache(
+                    user_prompt=user_prompt
+                )
+            else:
+                response_text, usage_metadata = self.llm.generate_response(
+                    sys_prompt=self.SYSTEM_PROMPT,
+                    user_prompt=user_prompt
+                )
             
             logger.info(f"Generated learning resources with web search. Usage: {usage_metadata}")
             
             # Parse response into LearningResource objects
             resources = self._parse_resources(response_text)
-            
+
             logger.info(f"Generated {len(resources)} learning resources")
+            if resources:
+                learning_resource_cache.set(cache_key, resources)
+                return [resource.model_copy() for resource in resources]
             return resources
         
         except Exception as e:
@@ -254,24 +333,43 @@ Generate the curated learning resources now:
             # Fallback to basic resources
             return self._generate_fallback_resources(resume, jd, scores)
     
+    @staticmethod
+    def _prep_scores(scores: Dict[str, float]) -> tuple:
+        """
+        Drop the overall_score entry once and pre-format the category block.
+
+        Returns:
+            (filtered (category, score) pairs, formatted markdown block)
+        """
+        items = [
+            (category, score)
+            for category, score in scores.items()
+            if category != "overall_score"
+        ]
+        formatted = "\n".join(
+            f"- **{category.replace('_', ' ').title()}**: {score:.1f}/100"
+            for category, score in items
+        )
+        return items, formatted
+
     def _identify_skill_gaps(
         self,
         resume: ResumeStructuredData,
         jd: JDStructuredData,
-        scores: Dict[str, float],
+        score_items: List[tuple],
         match_details: Dict[str, Dict[str, Any]]
     ) -> List[str]:
         """
         Identify specific skill gaps from analysis.
-        
+
         Returns:
             List of gap descriptions
         """
         gaps = []
-        
-        # Low scoring categories
-        for category, score in scores.items():
-            if category != "overall_score" and score < 70:
+
+        # Low scoring categories (overall_score already filtered out)
+        for category, score in score_items:
+            if score < 70:
                 gaps.append(f"Low score in {category.replace('_', ' ')} ({score:.1f}/100)")
         
         # Missing required skills
@@ -306,22 +404,23 @@ Generate the curated learning resources now:
             List of LearningResource objects
         """
         try:
-            # First, check if response is wrapped in markdown code blocks
-            if response_text.startswith("```"):
+            # Strip a markdown code fence around the response, if any
+            fence_match = _FENCE_RE.match(response_text)
+            if fence_match:
                 logger.debug("Response is wrapped in markdown code blocks, extracting JSON")
-                lines = response_text.strip().split('\n')
-                
-                # Remove opening ```json or ```
-                if lines[0].startswith("```"):
-                    lines = lines[1:]
-                
-                # Remove closing ```
-                if lines and lines[-1].strip() == "```":
-                    lines = lines[:-1]
-                
-                response_text = '\n'.join(lines).strip()
+                response_text = fence_match.group(1).strip()
                 logger.debug(f"Extracted JSON content (first 200 chars): {response_text[:200]}")
-            
+
+            # Fast path: a well-formed JSON array validates in one
+            # pydantic-core pass. Fall through to the lenient dict-probing
+            # path for wrapped objects or partially malformed items.
+            try:
+                resources = _RESOURCE_LIST_ADAPTER.validate_json(response_text)
+                logger.info(f"Successfully parsed {len(resources)} learning resources")
+                return resources
+            except ValidationError:
+                logger.debug("Direct list validation failed, falling back to lenient parsing")
+
             # Try to parse as JSON
             data = json.loads(response_text)
             logger.debug(f"Successfully parsed JSON response. Type: {type(data).__name__}")
@@ -394,10 +493,11 @@ Generate the curated learning resources now:
         
         fallback_resources = []
         
-        # Identify lowest scoring category
+        # Identify lowest scoring category; generator avoids materializing
+        # the filtered list just to take its min
         lowest_category = min(
-            [(cat, score) for cat, score in scores.items() if cat != "overall_score"],
-            key=lambda x: x[1],
+            ((cat, score) for cat, score in scores.items() if cat != "overall_score"),
+            key=operator.itemgetter(1),
             default=(None, 100)
         )
         
@@ -406,7 +506,7 @@ Generate the curated learning resources now:
         # Generic resources based on low-scoring categories
         if category_name == "skills_match" or score < 60:
             fallback_resources.extend([
-                LearningResource(
+                LearningResource.model_construct(
                     title="Technical Skills Development",
                     description="You should focus on building the technical skills required for this role through online courses and hands-on projects.",
                     category="technical_skills",
@@ -414,7 +514,7 @@ Generate the curated learning resources now:
                     url="https://www.coursera.org/",
                     estimated_hours=40
                 ),
-                LearningResource(
+                LearningResource.model_construct(
                     title="Industry Certification Path",
                     description="Consider obtaining relevant industry certifications to strengthen your qualifications and demonstrate expertise.",
                     category="certifications",
@@ -426,7 +526,7 @@ Generate the curated learning resources now:
         
         if category_name == "soft_skills_and_culture":
             fallback_resources.append(
-                LearningResource(
+                LearningResource.model_construct(
                     title="Professional Communication and Leadership",
                     description="You should develop your soft skills through structured courses in communication, teamwork, and leadership.",
                     category="soft_skills",
@@ -439,7 +539,7 @@ Generate the curated learning resources now:
         # Default resource if none added
         if not fallback_resources:
             fallback_resources.append(
-                LearningResource(
+                LearningResource.model_construct(
                     title="Skill Enhancement for Career Growth",
                     description="You should explore online learning platforms to continuously develop skills aligned with your career goals.",
                     category="technical_skills",
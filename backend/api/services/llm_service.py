@@ -1,13 +1,51 @@
+import hashlib
 import json
 import os
 import logging
+import threading
+import time
+from functools import lru_cache
 from google import genai
 from google.genai.types import Part, ThinkingConfig, GenerateContentConfig, CreateCachedContentConfig, Tool, GoogleSearch
-from typing import List, Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Cached-content handles shared across Gemini instances, keyed by
+# (model, system-prompt digest): one server-side cache per distinct system
+# prompt instead of one per service instance. Entries also memoize the
+# "prompt too small to cache" outcome (a None handle).
+_shared_cache_lock = threading.Lock()
+_shared_caches: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+
+# Recreate a shared cache once it has less than this long left to live, so
+# no request runs against a handle that expires mid-flight.
+_SHARED_CACHE_REFRESH_MARGIN_S = 600
+
+
+# Usage-metadata fields worth logging; everything else in the SDK object
+# (raw candidates, traffic details) is noise.
+_USAGE_FIELDS = frozenset({
+    "cached_content_token_count",
+    "candidates_token_count",
+    "prompt_token_count",
+    "thoughts_token_count",
+    "tool_use_prompt_token_count",
+    "total_token_count",
+})
+
+
+@lru_cache(maxsize=4)
+def _get_client(api_key: Optional[str]) -> genai.Client:
+    """
+    One genai.Client per API key, shared by every Gemini instance.
+
+    The client owns the HTTP transport; sharing it means all services reuse
+    one connection pool instead of paying DNS/TLS warmup per instance.
+    """
+    return genai.Client(api_key=api_key)
+
 class Gemini:
     """
     This class is used to generate responses from the Gemini API with context caching support.
@@ -18,7 +56,7 @@ class Gemini:
         self.thinkingConfig = thinkingConfig
         try:
             self.api_key = api_key if not None else os.getenv("GEMINI_API_KEY")
-            self.client = genai.Client(api_key=self.api_key)
+            self.client = _get_client(self.api_key)
         except Exception as e:
             logger.error(f"Gemini Client creation error: {str(e)}")
             raise
@@ -38,24 +76,11 @@ class Gemini:
             return None
         
         try:
-            # Manual extraction of common usage metadata fields
-            serialized = {}
-            
-            # Common fields in GenerateContentResponseUsageMetadata
-            fields_to_extract = [
-                "cached_content_token_count",
-                "candidates_token_count",
-                "prompt_token_count",
-                "thoughts_token_count",
-                "tool_use_prompt_token_count",
-                "total_token_count"
-            ]
-            
-            for field in fields_to_extract:
-                if hasattr(usage_metadata, field):
-                    value = getattr(usage_metadata, field)
-                    serialized[field] = value
-            
+            # One __dict__ snapshot filtered through the wanted-field set
+            # instead of a hasattr+getattr pair per field
+            fields = getattr(usage_metadata, "__dict__", None) or {}
+            serialized = {k: v for k, v in fields.items() if k in _USAGE_FIELDS}
+
             return serialized if serialized else {"raw_type": str(type(usage_metadata))}
             
         except Exception as e:
@@ -117,6 +142,32 @@ class Gemini:
             self.cached_content = None
             return None
     
+    def ensure_shared_cached_content(self, system_prompt: str, ttl_hours: int = 1) -> Optional[str]:
+        """
+        Point self.cached_content at the process-wide cache for this
+        (model, system prompt) pair, creating or refreshing it as needed.
+
+        Args:
+            system_prompt (str): The system prompt to cache
+            ttl_hours (int): Time to live in hours for newly created caches
+
+        Returns:
+            str | None: The shared cache ID, or None if the prompt is below
+            Gemini's minimum cacheable size or creation failed
+        """
+        key = (self.model, hashlib.sha256(system_prompt.encode()).hexdigest())
+        now = time.time()
+        with _shared_cache_lock:
+            entry = _shared_caches.get(key)
+            if entry is not None:
+                cached_content, expires_at = entry
+                if now < expires_at - _SHARED_CACHE_REFRESH_MARGIN_S:
+                    self.cached_content = cached_content
+                    return cached_content.name if cached_content else None
+            cache_id = self.create_cached_content(system_prompt=system_prompt, ttl_hours=ttl_hours)
+            _shared_caches[key] = (self.cached_content, now + ttl_hours * 3600)
+            return cache_id
+
     def generate_response_with_cache(
         self, 
         user_prompt: str, 
@@ -143,7 +194,7 @@ class Gemini:
                 model=self.model,
                 contents=[Part(text=user_prompt)],
                 config=GenerateContentConfig(
-                    #response_mime_type="application/json",
+                    response_mime_type="application/json" if response_schema else None,
                     response_schema=response_schema if response_schema else None,
                     thinking_config=self.thinkingConfig if self.thinkingConfig else None,
                     cached_content=self.cached_content.name,  # Use cached content reference
@@ -170,7 +221,7 @@ class Gemini:
                 model=self.model,
                 contents=[Part(text=user_prompt)],
                 config=GenerateContentConfig(
-                    #response_mime_type="application/json",
+                    response_mime_type="application/json" if response_schema else None,
                     response_schema=response_schema if response_schema else None,
                     system_instruction=sys_prompt,
                     thinking_config=self.thinkingConfig if self.thinkingConfig else None,
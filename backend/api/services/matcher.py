@@ -4,12 +4,16 @@ Optimized for low latency using set operations and minimal processing.
 """
 
 import logging
+import operator
 import re
 from typing import Dict, List, Set, Any
 from api._types import ResumeStructuredData, JDStructuredData
 
 logger = logging.getLogger(__name__)
 
+# C-level attribute access for list projections
+_GET_NAME = operator.attrgetter("name")
+
 
 class FastMatcherService:
     """
@@ -105,8 +109,8 @@ class FastMatcherService:
             "match_percentage": (matched_count / total_required * 100)
             if total_required > 0
             else 0.0,
-            "matched_items": sorted(list(total_matched)),
-            "missing_required": sorted(list(jd_required_skills - resume_skills)),
+            "matched_items": sorted(total_matched),
+            "missing_required": sorted(jd_required_skills - resume_skills),
         }
 
     def _match_experience(
@@ -120,7 +124,7 @@ class FastMatcherService:
         - JD required/preferred experience (parsed from experience string)
         """
         # Calculate total resume experience
-        total_years = sum(exp.duration for exp in (resume.experience or []))
+        total_years = resume.total_experience_years
 
         # Parse JD experience requirement (extract years from text)
         required_years = self._extract_years_from_text(
@@ -206,7 +210,7 @@ class FastMatcherService:
 
         # Check certifications
         resume_cert_names = self._normalize_list(
-            [cert.name for cert in (resume.certifications or [])]
+            list(map(_GET_NAME, resume.certifications or ()))
         )
 
         # Extract certification keywords from JD
@@ -286,7 +290,7 @@ class FastMatcherService:
             if total_required > 0
             else 0.0,
             "achievements_count": len(resume_achievements),
-            "matched_items": sorted(list(matched_keywords)),
+            "matched_items": sorted(matched_keywords),
         }
 
     def _match_soft_skills(
@@ -339,7 +343,7 @@ class FastMatcherService:
             "match_percentage": (matched / total_required * 100)
             if total_required > 0
             else 0.0,
-            "matched_items": sorted(list(matched_skills)),
+            "matched_items": sorted(matched_skills),
             "resume_soft_skills_count": len(resume_soft_skills),
         }
 
@@ -5,6 +5,7 @@ Provides personalized, second-person recommendations for resume formatting, stru
 
 import logging
 import json
+import operator
 from typing import Dict, Any, List
 from api.services.llm_service import Gemini
 from api._types import ResumeStructuredData, JDStructuredData
@@ -12,6 +13,9 @@ from api._utils.extraction_helpers import mask_pii_data
 
 logger = logging.getLogger(__name__)
 
+# C-level attribute access for list projections
+_GET_NAME = operator.attrgetter("name")
+
 
 class ResumeRecommendationService:
     """Generate AI-powered resume enhancement recommendations using LLM with cached system prompt."""
@@ -178,13 +182,13 @@ Generate the recommendations now as a JSON array:
             resume_data = {
                 "name": "[CANDIDATE_MASKED]",
                 "current_title": resume.job_title or "Not specified",
-                "total_experience_years": sum(exp.duration for exp in (resume.experience or [])),
+                "total_experience_years": resume.total_experience_years,
                 "education": [
                     {"degree": edu.degree, "school": "[SCHOOL_MASKED]"}
                     for edu in (resume.education or [])
                 ],
                 "technical_skills": resume.technical_skills[:15] if resume.technical_skills else [],
-                "certifications": [cert.name for cert in (resume.certifications or [])],
+                "certifications": list(map(_GET_NAME, resume.certifications or ())),
                 "projects_count": len(resume.projects or []),
                 "experience_count": len(resume.experience or []),
             }
@@ -115,9 +115,17 @@ class ScoringService:
             raise
 
 
+# Singleton service instance
+_scoring_service: ScoringService = None
+
+
 def get_scoring_service() -> ScoringService:
     """
     Get or create scoring service instance.
     Intended for dependency injection in FastAPI.
+    Singleton pattern for performance.
     """
-    return ScoringService()
+    global _scoring_service
+    if _scoring_service is None:
+        _scoring_service = ScoringService()
+    return _scoring_service
@@ -222,13 +222,21 @@ class SupabaseClient:
             logger.error(f"Failed to insert into {table}: {str(e)}")
             raise SupabaseInsertError(f"Failed to insert into {table}: {str(e)}")
 
-    async def select(self, table: str, query_filter: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def select(
+        self,
+        table: str,
+        query_filter: Dict[str, Any],
+        columns: str = "*",
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Select records from a database table asynchronously.
 
         Args:
             table: Table name
             query_filter: Filter conditions as dict {column: value}
+            columns: Comma-separated columns to fetch (default all)
+            limit: Maximum number of rows, pushed down to PostgREST
 
         Returns:
             List of matching records
@@ -240,9 +248,11 @@ class SupabaseClient:
             logger.debug(f"Selecting from table '{table}' with filter: {query_filter}")
 
             # Build query
-            query = self.client.table(table).select("*")
+            query = self.client.table(table).select(columns)
             for key, value in query_filter.items():
                 query = query.eq(key, value)
+            if limit is not None:
+                query = query.limit(limit)
 
             # Run blocking select in thread pool
             result = await asyncio.to_thread(lambda: query.execute())